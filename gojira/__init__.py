@@ -2,7 +2,6 @@
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
 import asyncio
-from contextlib import suppress
 from pathlib import Path
 
 import uvloop
@@ -14,25 +13,18 @@ from cashews import cache
 
 from gojira.config import config
 from gojira.utils.aiohttp import AniListClient, JikanClient, TraceMoeClient
+from gojira.utils.bot_api import create_session
+from gojira.utils.cache import setup_cache
 from gojira.utils.logging import log
-from gojira.utils.systools import ShellExceptionError, shell_run
 
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-commit_count = "None"
-commit_hash = "None"
-with suppress(ShellExceptionError):
-    commit_count = asyncio.run(shell_run("git rev-list --count HEAD"))
-    commit_hash = asyncio.run(shell_run("git rev-parse --short HEAD"))
-
-__version__ = f"{commit_hash} ({commit_count})"
-
-log.info("Starting Gojira...", version=__version__)
+log.info("Starting Gojira...")
 
 app_dir: Path = Path(__file__).parent.parent
 locales_dir: Path = app_dir / "locales"
 
-cache.setup(f"redis://{config.redis_host}", client_side=True)
+setup_cache(cache)
 
 # Aiohttp Clients
 AniList = AniListClient()
@@ -41,6 +33,7 @@ Jikan = JikanClient()
 
 bot = Bot(
     token=config.bot_token.get_secret_value(),
+    session=create_session(),
     default=DefaultBotProperties(
         parse_mode=ParseMode.HTML,
     ),
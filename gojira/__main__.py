@@ -2,81 +2,151 @@
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
 import asyncio
+import os
+import signal
 import sys
+from collections.abc import Callable
 from contextlib import suppress
+from functools import partial
 
-import sentry_sdk
+from aiogram import Dispatcher
 from aiogram import __version__ as aiogram_version
 from aiogram.exceptions import TelegramForbiddenError
 from aiosqlite import __version__ as aiosqlite_version
-from cashews.exceptions import CacheBackendInteractionError
-from sentry_sdk.integrations.aiohttp import AioHttpIntegration
-from sentry_sdk.integrations.redis import RedisIntegration
 
-from gojira import AniList, Jikan, TraceMoe, bot, cache, config, dp, i18n
-from gojira import __version__ as gojira_version
-from gojira.database import create_tables
+from gojira import bot, cache, config, dp, i18n
 from gojira.handlers import load_modules
-from gojira.middlewares.acl import ACLMiddleware
-from gojira.middlewares.i18n import MyI18nMiddleware
+from gojira.lifecycle import setup, setup_storage, teardown, worker
+from gojira.middlewares.concurrency import dispatch_controller
+from gojira.middlewares.startup import startup_timer
 from gojira.utils.command_list import set_ui_commands
 from gojira.utils.logging import log
+from gojira.utils.prefork import RESTART_SIGNAL, WorkerPool
+from gojira.utils.systools import get_version
+from gojira.utils.webhook import run_webhook
+
+
+async def receive_updates(
+    dispatcher: Dispatcher,
+    allowed_updates: list[str],
+    metrics: Callable[[], dict[str, int]] | None = None,
+) -> None:
+    if config.webhook_url:
+        await run_webhook(dispatcher, bot, allowed_updates=allowed_updates, metrics=metrics)
+    else:
+        # getUpdates is refused while a webhook is set
+        await bot.delete_webhook()
+        # the receiver of prefork mode only forwards, it must keep the update order
+        await dispatcher.start_polling(
+            bot, allowed_updates=allowed_updates, handle_as_tasks=dispatcher is dp
+        )
 
 
-async def main():
+async def send_startup_notification(chat_id: int, version: str) -> None:
+    log.info("Sending startup notification.")
+    with suppress(TelegramForbiddenError):
+        await bot.send_message(
+            chat_id,
+            text=(
+                "<b>Gojira is up and running!</b>\n\n"
+                f"<b>Version:</b> <code>{version}</code>\n"
+                f"<b>AIOgram version:</b> <code>{aiogram_version}</code>\n"
+                f"<b>AIOSQLite version:</b> <code>{aiosqlite_version}</code>"
+            ),
+        )
+
+
+async def announce_startup() -> None:
     try:
-        await cache.ping()
-    except (CacheBackendInteractionError, TimeoutError):
-        sys.exit(log.critical("Can't connect to RedisDB! Exiting..."))
+        version = await get_version()
+        log.info("Gojira is up and running!", version=version)
+        if config.logs_channel:
+            await send_startup_notification(config.logs_channel, version)
+    except Exception:
+        log.error("Failed to announce startup!", exc_info=True)
 
-    await create_tables()
 
-    if config.sentry_url:
-        log.info("Starting sentry.io integraion.")
+async def upload_commands() -> None:
+    try:
+        await set_ui_commands(bot, i18n)
+    except Exception:
+        log.error("Failed to upload command menus!", exc_info=True)
 
-        sentry_sdk.init(
-            str(config.sentry_url),
-            traces_sample_rate=1.0,
-            integrations=[RedisIntegration(), AioHttpIntegration()],
-        )
 
-    dp.message.middleware(ACLMiddleware())
-    dp.message.middleware(MyI18nMiddleware(i18n=i18n))
-    dp.callback_query.middleware(ACLMiddleware())
-    dp.callback_query.middleware(MyI18nMiddleware(i18n=i18n))
-    dp.inline_query.middleware(ACLMiddleware())
-    dp.inline_query.middleware(MyI18nMiddleware(i18n=i18n))
+async def mark_ready(workers: WorkerPool | None = None) -> None:
+    # ready once updates are received, in prefork mode once workers can handle them too
+    if workers is not None:
+        await workers.wait_ready()
+    startup_timer.mark_ready()
 
-    load_modules(dp)
 
-    await set_ui_commands(bot, i18n)
+async def main():
+    prefork = config.workers > 1
+    if prefork:
+        if config.cache_backend != "redis":
+            log.warning("Workers only share language caches through Redis.")
 
-    with suppress(TelegramForbiddenError):
-        if config.logs_channel:
-            log.info("Sending startup notification.")
-            await bot.send_message(
-                config.logs_channel,
-                text=(
-                    "<b>Gojira is up and running!</b>\n\n"
-                    f"<b>Version:</b> <code>{gojira_version}</code>\n"
-                    f"<b>AIOgram version:</b> <code>{aiogram_version}</code>\n"
-                    f"<b>AIOSQLite version:</b> <code>{aiosqlite_version}</code>"
-                ),
-            )
+        # handlers are only loaded to know which update types to receive
+        load_modules(dp)
+        background_tasks = await setup_storage()
+    else:
+        background_tasks = await setup()
 
-    # resolve used update types
-    useful_updates = dp.resolve_used_update_types()
-    await dp.start_polling(bot, allowed_updates=useful_updates)
+    # restart() signals the receiver, which execs itself once torn down
+    restart = asyncio.Event()
+
+    def restart_receiver() -> None:
+        restart.set()
+        os.kill(os.getpid(), signal.SIGINT)
 
-    # close aiohttp connections
-    log.info("Closing aiohttp connections.")
-    await AniList.close()
-    await Jikan.close()
-    await TraceMoe.close()
+    asyncio.get_running_loop().add_signal_handler(RESTART_SIGNAL, restart_receiver)
 
-    # clear cashews cache
-    log.info("Clearing cashews cache.")
-    await cache.clear()
+    # menus and the startup notification don't hold back the first update, nor each other
+    announcements = [
+        asyncio.create_task(announce_startup()),
+        asyncio.create_task(upload_commands()),
+    ]
+
+    # resolve used update types
+    useful_updates = dp.resolve_used_update_types()
+    if prefork:
+        workers = WorkerPool(
+            worker,
+            workers=config.workers,
+            queue_size=config.worker_queue_size,
+            stop_timeout=config.worker_stop_timeout,
+            metrics=tuple(dispatch_controller.metrics),
+        )
+        workers.start()
+
+        receiver = Dispatcher()
+        receiver.update.outer_middleware(startup_timer)
+        receiver.update.outer_middleware(workers)
+        receiver.startup.register(partial(mark_ready, workers))
+        try:
+            await receive_updates(receiver, useful_updates, metrics=workers.metrics.total)
+        finally:
+            log.info("Stopping worker processes.")
+            await workers.stop()
+    else:
+        dp.startup.register(mark_ready)
+        await receive_updates(dp, useful_updates)
+
+    for task in announcements:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    await teardown(background_tasks)
+
+    # clear cashews cache, the disk cache is meant to outlive restarts and
+    # the memory one goes away with the process
+    if config.cache_backend == "redis":
+        log.info("Clearing cashews cache.")
+        await cache.clear()
+
+    if restart.is_set():
+        os.execv(sys.executable, [sys.executable, "-m", "gojira"])
 
 
 if __name__ == "__main__":
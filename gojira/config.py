@@ -1,18 +1,96 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from typing import ClassVar
+from typing import ClassVar, Literal, Self
 
-from pydantic import AnyHttpUrl, SecretStr
+from pydantic import AnyHttpUrl, SecretStr, model_validator
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     bot_token: SecretStr
+    gojira_version: str | None = None
+    bot_api_url: AnyHttpUrl | None = None
+    bot_api_local: bool = False
+    bot_api_server_dir: str | None = None
+    bot_api_local_dir: str | None = None
     redis_host: str = "localhost"
+    cache_backend: Literal["redis", "memory", "disk"] = "redis"
+    cache_memory_size: int = 10_000
+    cache_disk_dir: str = "data/cache"
+    cache_disk_size: int = 1024**3
+    cache_redis_retry: int = 30
+    blob_store_dir: str = "data/blobs"
+    blob_store_size: int = 512 * 1024**2
+    scan_dhash_threshold: int = 3
+    scan_image_size: int = 640
+    scan_image_quality: int = 85
+    scan_workers: int = 2
+    scan_video_frames: int = 4
+    scan_scene_threshold: float = 0.3
+    ffmpeg_path: str = "ffmpeg"
+    ffmpeg_workers: int = 2
+    ffmpeg_timeout: float = 30
+    trace_moe_url: str = "https://api.trace.moe"
+    trace_moe_concurrency: int = 1
+    anilist_hedge_budget: float = 0.05
+    trace_moe_quota_refresh: float = 300
+    scan_concurrency: int = 4
+    scan_user_concurrency: int = 1
+    scan_position_interval: float = 5
     sentry_url: AnyHttpUrl | None = None
     sudoers: ClassVar[list[int]] = [918317361]
     logs_channel: int | None = None
+    database_backend: Literal["sqlite", "postgres"] = "sqlite"
+    postgres_dsn: SecretStr | None = None
+    postgres_pool_size: int = 10
+    language_cache_size: int = 100_000
+    write_flush_interval: float = 0.05
+    write_batch_size: int = 500
+    vacuum_interval: int = 600
+    vacuum_idle_time: int = 60
+    webhook_url: AnyHttpUrl | None = None
+    webhook_path: str = "/webhook"
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+    webhook_secret: SecretStr | None = None
+    webhook_max_connections: int = 40
+    webhook_concurrency: int = 100
+    webhook_queue_size: int = 1000
+    webhook_drain_timeout: float = 30
+    dispatch_concurrency: int = 64
+    dispatch_queue_size: int = 256
+    dispatch_inline_max_age: float = 5
+    inline_debounce: float = 0.25
+    inline_cache_time: int = 300
+    throttle_window: float = 60
+    throttle_rates: dict[str, int] = {
+        "message": 20,
+        "callback": 40,
+        "inline": 60,
+        "scan": 5,
+    }
+    throttle_local_share: float = 0.5
+    deadline_budgets: dict[str, float] = {
+        "message": 20,
+        "callback": 10,
+        "inline": 8,
+        "scan": 300,
+    }
+    send_global_rate: float = 30
+    send_group_rate: float = 20
+    send_max_retries: int = 3
+    workers: int = 1
+    worker_queue_size: int = 10_000
+    worker_stop_timeout: float = 60
+
+    @model_validator(mode="after")
+    def check_bot_api(self) -> Self:
+        # Local mode only means something for a self-hosted server
+        if self.bot_api_local and not self.bot_api_url:
+            msg = "BOT_API_LOCAL needs BOT_API_URL to point at a self-hosted Bot API server."
+            raise ValueError(msg)
+        return self
 
     class Config:
         env_file = "data/config.env"
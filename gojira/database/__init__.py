@@ -1,8 +1,30 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from .base import DB_PATH, SqliteConnection, SqliteDBConn, create_tables
+from .backends import StorageBackend, StorageError
+from .base import DB_PATH, SqliteConnection, SqliteDBConn
+from .cache import LanguageEntry, language_cache
 from .chats import Chats
+from .migrations import MIGRATIONS, migrate
+from .storage import storage
 from .users import Users
+from .vacuum import vacuum_loop
+from .writer import WriteBehindQueue, write_queue
 
-__all__ = ("DB_PATH", "Chats", "SqliteConnection", "SqliteDBConn", "Users", "create_tables")
+__all__ = (
+    "DB_PATH",
+    "MIGRATIONS",
+    "Chats",
+    "LanguageEntry",
+    "SqliteConnection",
+    "SqliteDBConn",
+    "StorageBackend",
+    "StorageError",
+    "Users",
+    "WriteBehindQueue",
+    "language_cache",
+    "migrate",
+    "storage",
+    "vacuum_loop",
+    "write_queue",
+)
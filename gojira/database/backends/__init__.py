@@ -0,0 +1,7 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from .base import TABLES, StorageBackend, StorageError, storage_errors
+from .sqlite import SqliteBackend
+
+__all__ = ("TABLES", "SqliteBackend", "StorageBackend", "StorageError", "storage_errors")
@@ -0,0 +1,59 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+TABLES: tuple[str, ...] = ("users", "chats")
+
+
+class StorageError(Exception):
+    """The storage could not be read, which is not the same as a missing row."""
+
+
+@contextmanager
+def storage_errors(*errors: type[Exception]) -> Iterator[None]:
+    """Raise the backend's own errors as `StorageError`."""
+    try:
+        yield
+    except errors as error:
+        raise StorageError(str(error)) from error
+
+
+class StorageBackend(ABC):
+    """Persistent storage of user and chat languages behind `Users` and `Chats`.
+
+    Reads raise `StorageError` when the storage can't be reached, whatever the backend.
+    """
+
+    @abstractmethod
+    async def setup(self) -> None:
+        """Open the storage, it must be migrated already."""
+
+    @abstractmethod
+    async def migrate(self) -> None:
+        """Bring the schema up to date, once per start and before any worker opens it."""
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def get_language(self, table: str, obj_id: int) -> tuple[bool, str | None]:
+        """Return whether the row exists and its language code.
+
+        Raise `StorageError` if the row can't be read.
+        """
+
+    @abstractmethod
+    async def upsert_languages(self, batches: dict[str, dict[int, str | None]]) -> None:
+        """Insert or update rows in one transaction, `None` keeps the stored language."""
+
+    @abstractmethod
+    async def get_language_counts(self, table: str) -> dict[str, int]: ...
+
+    @abstractmethod
+    async def get_size(self) -> int: ...
+
+    @abstractmethod
+    async def vacuum(self) -> None: ...
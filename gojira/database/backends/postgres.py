@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from typing import override
+
+import asyncpg
+
+from gojira.utils.deadline import bounded
+from gojira.utils.logging import log
+
+from .base import TABLES, StorageBackend, storage_errors
+
+ERRORS: tuple[type[Exception], ...] = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError)
+
+UPSERT_SQL: str = """
+    INSERT INTO {table} (id, language_code)
+    SELECT * FROM unnest($1::bigint[], $2::text[])
+    ON CONFLICT (id) DO UPDATE SET
+        language_code = COALESCE(excluded.language_code, {table}.language_code)
+"""
+
+# Append new migrations at the end, never reorder or remove applied ones
+MIGRATIONS: tuple[str, ...] = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id BIGINT PRIMARY KEY,
+        language_code TEXT
+    );
+    CREATE TABLE IF NOT EXISTS chats (
+        id BIGINT PRIMARY KEY,
+        language_code TEXT
+    );
+    """,
+    """
+    CREATE TABLE language_stats (
+        table_name TEXT NOT NULL,
+        language_code TEXT NOT NULL,
+        count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (table_name, language_code)
+    );
+
+    CREATE FUNCTION update_language_stats() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND OLD.language_code IS NOT DISTINCT FROM NEW.language_code THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE language_stats SET count = count - 1
+            WHERE table_name = TG_TABLE_NAME
+                AND language_code = COALESCE(OLD.language_code, '');
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO language_stats (table_name, language_code, count)
+            VALUES (TG_TABLE_NAME, COALESCE(NEW.language_code, ''), 1)
+            ON CONFLICT (table_name, language_code)
+            DO UPDATE SET count = language_stats.count + 1;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE TRIGGER users_language_stats
+    AFTER INSERT OR DELETE OR UPDATE OF language_code ON users
+    FOR EACH ROW EXECUTE FUNCTION update_language_stats();
+
+    CREATE TRIGGER chats_language_stats
+    AFTER INSERT OR DELETE OR UPDATE OF language_code ON chats
+    FOR EACH ROW EXECUTE FUNCTION update_language_stats();
+
+    INSERT INTO language_stats (table_name, language_code, count)
+    SELECT 'users', COALESCE(language_code, ''), COUNT(*) FROM users GROUP BY 2
+    UNION ALL
+    SELECT 'chats', COALESCE(language_code, ''), COUNT(*) FROM chats GROUP BY 2;
+    """,
+)
+
+
+class PostgresBackend(StorageBackend):
+    def __init__(self, dsn: str, pool_size: int) -> None:
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self._pool: asyncpg.Pool | None = None
+
+    @property
+    def pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            msg = "PostgreSQL backend is not set up."
+            raise RuntimeError(msg)
+        return self._pool
+
+    @override
+    async def setup(self) -> None:
+        self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+
+    @override
+    async def migrate(self) -> None:
+        async with self.pool.acquire() as conn, conn.transaction():
+            # Serialize migrations between instances starting at the same time
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('gojira_migrations'))")
+            await conn.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER)")
+            version = await conn.fetchval("SELECT MAX(version) FROM schema_version") or 0
+
+            for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                log.info("Applying database migration...", version=number)
+                await conn.execute(migration)
+                await conn.execute("INSERT INTO schema_version (version) VALUES ($1)", number)
+
+    @override
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @override
+    async def get_language(self, table: str, obj_id: int) -> tuple[bool, str | None]:
+        async with bounded():
+            with storage_errors(*ERRORS):
+                row = await self.pool.fetchrow(
+                    f"SELECT language_code FROM {table} WHERE id = $1",
+                    obj_id,
+                )
+        return row is not None, row["language_code"] if row else None
+
+    @override
+    async def upsert_languages(self, batches: dict[str, dict[int, str | None]]) -> None:
+        async with self.pool.acquire() as conn, conn.transaction():
+            for table in TABLES:
+                if rows := batches.get(table):
+                    await conn.execute(
+                        UPSERT_SQL.format(table=table),
+                        list(rows.keys()),
+                        list(rows.values()),
+                    )
+
+    @override
+    async def get_language_counts(self, table: str) -> dict[str, int]:
+        async with bounded():
+            with storage_errors(*ERRORS):
+                rows = await self.pool.fetch(
+                    "SELECT language_code, count FROM language_stats WHERE table_name = $1",
+                    table,
+                )
+        return {row["language_code"]: row["count"] for row in rows}
+
+    @override
+    async def get_size(self) -> int:
+        with storage_errors(*ERRORS):
+            return await self.pool.fetchval("SELECT pg_database_size(current_database())")
+
+    @override
+    async def vacuum(self) -> None:
+        # PostgreSQL's autovacuum daemon takes care of it
+        return
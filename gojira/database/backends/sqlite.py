@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import sqlite3
+from typing import override
+
+from gojira.database import migrations
+from gojira.database.base import DB_PATH, SqliteConnection, SqliteDBConn
+from gojira.utils.logging import log
+
+from .base import StorageBackend, storage_errors
+
+ERRORS: tuple[type[Exception], ...] = (sqlite3.Error, OSError)
+
+UPSERT_SQL: str = """
+    INSERT INTO {table} (id, language_code) VALUES (?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        language_code = COALESCE(excluded.language_code, language_code)
+"""
+
+
+class SqliteBackend(StorageBackend):
+    @override
+    async def setup(self) -> None:
+        return
+
+    @override
+    async def migrate(self) -> None:
+        await migrations.migrate()
+
+    @override
+    async def close(self) -> None:
+        return
+
+    @override
+    async def get_language(self, table: str, obj_id: int) -> tuple[bool, str | None]:
+        sql = f"SELECT language_code FROM {table} WHERE id = ?"
+        params = (obj_id,)
+        with storage_errors(*ERRORS):
+            r = await SqliteConnection._make_request(sql, params, fetch=True)
+        return r is not None, r[0] if r else None
+
+    @override
+    async def upsert_languages(self, batches: dict[str, dict[int, str | None]]) -> None:
+        async with SqliteDBConn(DB_PATH) as conn:
+            for table, rows in batches.items():
+                await conn.executemany(UPSERT_SQL.format(table=table), list(rows.items()))
+            await conn.commit()
+
+    @override
+    async def get_language_counts(self, table: str) -> dict[str, int]:
+        sql = "SELECT language_code, count FROM language_stats WHERE table_name = ?"
+        params = (table,)
+        with storage_errors(*ERRORS):
+            r = await SqliteConnection._make_request(sql, params, fetch=True, mult=True)
+        return {row[0]: row[1] for row in r} if isinstance(r, list) else {}
+
+    @override
+    async def get_size(self) -> int:
+        with storage_errors(*ERRORS):
+            return DB_PATH.stat().st_size
+
+    @override
+    async def vacuum(self, max_pages: int = 1000) -> None:
+        async with SqliteDBConn(DB_PATH) as conn:
+            cursor = await conn.execute("PRAGMA auto_vacuum")
+            row = await cursor.fetchone()
+            if not row or row[0] != 2:
+                # Converted by the migrations, a full VACUUM would block every writer
+                return
+
+            cursor = await conn.execute("PRAGMA freelist_count")
+            row = await cursor.fetchone()
+            if not row or not row[0]:
+                return
+
+            log.debug("Running incremental vacuum...", free_pages=row[0])
+            cursor = await conn.execute(f"PRAGMA incremental_vacuum({max_pages})")
+            await cursor.fetchall()
+            await conn.commit()
@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
+import asyncio
 from pathlib import Path
 from types import TracebackType
 from typing import Any, TypeVar
@@ -8,6 +9,7 @@ from typing import Any, TypeVar
 import aiosqlite
 
 from gojira import app_dir
+from gojira.utils.deadline import DeadlineExceededError, bounded
 from gojira.utils.logging import log
 
 T = TypeVar("T")
@@ -44,22 +46,27 @@ class SqliteConnection:
     ) -> Any:
         async with SqliteDBConn(DB_PATH) as conn:
             try:
-                cursor = (
-                    await conn.executemany(sql, params)
-                    if isinstance(params, list)
-                    else await conn.execute(sql, params)
-                )
-            except BaseException:
+                async with bounded():
+                    cursor = (
+                        await conn.executemany(sql, params)
+                        if isinstance(params, list)
+                        else await conn.execute(sql, params)
+                    )
+                    if fetch:
+                        return await cursor.fetchall() if mult else await cursor.fetchone()
+                    await conn.commit()
+            except (DeadlineExceededError, asyncio.CancelledError):
+                # The statement keeps running in aiosqlite's thread and close() would wait for it
+                await conn.interrupt()
+                raise
+            except Exception:
                 log.error(
                     "Error executing SQL query!",
                     sql_query=sql,
                     sql_params=params,
                     exc_info=True,
                 )
-            else:
-                if fetch:
-                    return await cursor.fetchall() if mult else await cursor.fetchone()
-                await conn.commit()
+                raise
 
     @staticmethod
     def _convert_to_model(data: dict, model: type[T]) -> T:
@@ -85,24 +92,3 @@ class SqliteConnection:
         return (
             SqliteConnection._convert_to_model(raw, model_type) if model_type is not None else raw
         )
-
-
-async def create_tables() -> None:
-    await SqliteConnection._make_request(
-        sql="""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY,
-            language_code TEXT
-        );
-        """,
-    )
-    await SqliteConnection._make_request(
-        sql="""
-        CREATE TABLE IF NOT EXISTS chats (
-            id INTEGER PRIMARY KEY,
-            language_code TEXT
-        );
-        """,
-    )
-    await SqliteConnection._make_request(sql="PRAGMA journal_mode=WAL")
-    await SqliteConnection._make_request(sql="VACUUM")
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from contextlib import suppress
+from typing import NamedTuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from gojira.config import config
+from gojira.utils.logging import log
+
+
+class LanguageEntry(NamedTuple):
+    exists: bool
+    language_code: str | None
+
+
+class LanguageCache:
+    """Bounded LRU cache of user/chat languages kept coherent through Redis pub/sub."""
+
+    channel: str = "gojira:language_cache"
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, int], LanguageEntry] = OrderedDict()
+        self._instance_id = uuid.uuid4().hex
+        self._redis: Redis | None = None
+
+    def get(self, table: str, obj_id: int) -> LanguageEntry | None:
+        key = (table, obj_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, table: str, obj_id: int, entry: LanguageEntry) -> None:
+        key = (table, obj_id)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def setdefault(self, table: str, obj_id: int, entry: LanguageEntry) -> LanguageEntry:
+        # A write may have landed while the entry was being read from the database
+        if (cached := self.get(table, obj_id)) is not None:
+            return cached
+
+        self.set(table, obj_id, entry)
+        return entry
+
+    def invalidate(self, table: str, obj_id: int) -> None:
+        self._entries.pop((table, obj_id), None)
+
+    async def publish(self, table: str, *obj_ids: int) -> None:
+        if self._redis is None or not obj_ids:
+            return
+
+        message = f"{self._instance_id}:{table}:{",".join(map(str, obj_ids))}"
+        with suppress(RedisError, OSError):
+            await self._redis.publish(self.channel, message)
+
+    async def listen(self, redis_url: str) -> None:
+        self._redis = Redis.from_url(redis_url)
+        try:
+            while True:
+                try:
+                    await self._subscribe()
+                except (RedisError, OSError) as error:
+                    log.warning("Language cache invalidation channel lost!", error=str(error))
+
+                # Invalidations may have been missed while disconnected
+                self._entries.clear()
+                await asyncio.sleep(5)
+        finally:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _subscribe(self) -> None:
+        if self._redis is None:
+            return
+
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                try:
+                    instance_id, table, obj_ids = message["data"].decode().split(":")
+                    ids = [int(obj_id) for obj_id in obj_ids.split(",")]
+                except ValueError:
+                    log.warning("Ignored malformed language cache message.", data=message["data"])
+                    continue
+
+                if instance_id == self._instance_id:
+                    continue
+
+                for obj_id in ids:
+                    self.invalidate(table, obj_id)
+        finally:
+            await pubsub.aclose()
+
+
+language_cache = LanguageCache(maxsize=config.language_cache_size)
@@ -1,47 +1,50 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from typing import Literal
-
 from aiogram.types import Chat
 
-from .base import SqliteConnection
+from .cache import LanguageEntry, language_cache
+from .storage import storage
+from .writer import write_queue
 
 
-class Chats(SqliteConnection):
+class Chats:
     @staticmethod
-    async def get_chat(chat: Chat) -> list | str | None:
-        sql = "SELECT * FROM chats WHERE id = ?"
-        params = (chat.id,)
-        return await Chats._make_request(sql, params, fetch=True, mult=True) or None
+    async def get_language_entry(chat: Chat) -> LanguageEntry:
+        if (entry := language_cache.get("chats", chat.id)) is not None:
+            return entry
+
+        exists, language_code = write_queue.get_pending("chats", chat.id)
+        if language_code is None:
+            # A failed read raises StorageError, so it never gets cached as "not registered"
+            stored, language_code = await storage.get_language("chats", chat.id)
+            exists = exists or stored
+
+        entry = LanguageEntry(exists=exists, language_code=language_code)
+        return language_cache.setdefault("chats", chat.id, entry)
 
     @staticmethod
     async def register_chat(chat: Chat) -> None:
-        sql = "INSERT INTO chats (id) VALUES (?)"
-        params = (chat.id,)
-        await Chats._make_request(sql, params)
+        if (entry := language_cache.get("chats", chat.id)) is not None:
+            language_cache.set("chats", chat.id, entry._replace(exists=True))
+        write_queue.put("chats", chat.id)
 
     @staticmethod
     async def get_language(chat: Chat) -> str | None:
-        sql = "SELECT language_code FROM chats WHERE id = ?"
-        params = (chat.id,)
-        r = await Chats._make_request(sql, params, fetch=True)
-        return r[0] if r and r[0] else None
+        return (await Chats.get_language_entry(chat)).language_code or None
 
     @staticmethod
     async def set_language(chat: Chat, language_code: str) -> None:
-        sql = "UPDATE chats SET language_code = ? WHERE id = ?"
-        params = (language_code, chat.id)
-        if not await Chats.get_chat(chat):
-            sql = "INSERT INTO chats (language_code, id) VALUES (?, ?)"
-        await Chats._make_request(sql, params)
+        language_cache.set(
+            "chats", chat.id, LanguageEntry(exists=True, language_code=language_code)
+        )
+        write_queue.put("chats", chat.id, language_code)
+
+    @staticmethod
+    async def get_language_counts() -> dict[str, int]:
+        return await storage.get_language_counts("chats")
 
     @staticmethod
-    async def get_chats_count(language_code: str | None = None) -> str | Literal[0]:
-        sql = "SELECT COUNT(*) FROM chats"
-        params = ()
-        if language_code:
-            sql += " WHERE language_code = ?"
-            params = (language_code,)
-        r = await Chats._make_request(sql, params, fetch=True)
-        return r[0] if r and r[0] else 0
+    async def get_chats_count(language_code: str | None = None) -> int:
+        counts = await Chats.get_language_counts()
+        return counts.get(language_code, 0) if language_code else sum(counts.values())
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from collections.abc import Awaitable, Callable
+
+import aiosqlite
+
+from gojira.utils.logging import log
+
+from .base import DB_PATH, SqliteDBConn
+
+Migration = Callable[[aiosqlite.Connection], Awaitable[None]]
+
+
+async def enable_incremental_vacuum(conn: aiosqlite.Connection) -> None:
+    # Only takes effect right away on a new database, existing ones are
+    # converted by convert_to_incremental_vacuum
+    await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+async def create_tables(conn: aiosqlite.Connection) -> None:
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            language_code TEXT
+        );
+        """
+    )
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chats (
+            id INTEGER PRIMARY KEY,
+            language_code TEXT
+        );
+        """
+    )
+
+
+async def create_language_stats(conn: aiosqlite.Connection) -> None:
+    # Per-language row counts, kept up to date by triggers so /stats never scans the tables
+    await conn.execute("DROP TABLE IF EXISTS language_stats")
+    await conn.execute(
+        """
+        CREATE TABLE language_stats (
+            table_name TEXT NOT NULL,
+            language_code TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, language_code)
+        ) WITHOUT ROWID;
+        """
+    )
+
+    for table in ("users", "chats"):
+        increment = f"""
+            INSERT INTO language_stats (table_name, language_code, count)
+            VALUES ('{table}', COALESCE(new.language_code, ''), 1)
+            ON CONFLICT (table_name, language_code) DO UPDATE SET count = count + 1;
+        """
+        decrement = f"""
+            UPDATE language_stats SET count = count - 1
+            WHERE table_name = '{table}' AND language_code = COALESCE(old.language_code, '');
+        """
+        await conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_stats_insert AFTER INSERT ON {table}
+            BEGIN {increment} END;
+            """
+        )
+        await conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_stats_update
+            AFTER UPDATE OF language_code ON {table}
+            WHEN old.language_code IS NOT new.language_code
+            BEGIN {decrement} {increment} END;
+            """
+        )
+        await conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_stats_delete AFTER DELETE ON {table}
+            BEGIN {decrement} END;
+            """
+        )
+        await conn.execute(
+            f"""
+            INSERT INTO language_stats (table_name, language_code, count)
+            SELECT '{table}', COALESCE(language_code, ''), COUNT(*)
+            FROM {table} GROUP BY COALESCE(language_code, '');
+            """
+        )
+
+
+async def convert_to_incremental_vacuum(conn: aiosqlite.Connection) -> None:
+    # Existing databases need one full rebuild, it locks the whole database so it
+    # runs here, before any update is served
+    cursor = await conn.execute("PRAGMA auto_vacuum")
+    row = await cursor.fetchone()
+    if row and row[0] != 2:
+        log.info("Converting database to incremental auto-vacuum...")
+        await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        await conn.execute("VACUUM")
+
+
+# Append new migrations at the end, never reorder or remove applied ones
+MIGRATIONS: tuple[Migration, ...] = (
+    enable_incremental_vacuum,
+    create_tables,
+    create_language_stats,
+    convert_to_incremental_vacuum,
+)
+
+
+async def migrate() -> None:
+    async with SqliteDBConn(DB_PATH) as conn:
+        cursor = await conn.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        version = row[0] if row else 0
+
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            log.info("Applying database migration...", version=number, name=migration.__name__)
+            await migration(conn)
+            await conn.execute(f"PRAGMA user_version = {number}")
+            await conn.commit()
+
+        # Set after the migrations so a new database still gets its auto_vacuum mode
+        await conn.execute("PRAGMA journal_mode=WAL")
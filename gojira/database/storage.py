@@ -0,0 +1,22 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from importlib import import_module
+
+from gojira.config import config
+
+from .backends import SqliteBackend, StorageBackend
+
+
+def create_backend() -> StorageBackend:
+    if config.database_backend == "postgres":
+        # asyncpg is an optional dependency, only import it when it's needed
+        postgres = import_module("gojira.database.backends.postgres")
+        return postgres.PostgresBackend(
+            dsn=config.postgres_dsn.get_secret_value() if config.postgres_dsn else "",
+            pool_size=config.postgres_pool_size,
+        )
+    return SqliteBackend()
+
+
+storage: StorageBackend = create_backend()
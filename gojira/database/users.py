@@ -1,46 +1,50 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from typing import Literal
-
 from aiogram.types import User
 
-from .base import SqliteConnection
+from .cache import LanguageEntry, language_cache
+from .storage import storage
+from .writer import write_queue
 
 
-class Users(SqliteConnection):
+class Users:
     @staticmethod
-    async def get_user(user: User) -> list | str | None:
-        sql = "SELECT * FROM users WHERE id = ?"
-        params = (user.id,)
-        return await Users._make_request(sql, params, fetch=True, mult=True) or None
+    async def get_language_entry(user: User) -> LanguageEntry:
+        if (entry := language_cache.get("users", user.id)) is not None:
+            return entry
+
+        exists, language_code = write_queue.get_pending("users", user.id)
+        if language_code is None:
+            # A failed read raises StorageError, so it never gets cached as "not registered"
+            stored, language_code = await storage.get_language("users", user.id)
+            exists = exists or stored
+
+        entry = LanguageEntry(exists=exists, language_code=language_code)
+        return language_cache.setdefault("users", user.id, entry)
 
     @staticmethod
     async def register_user(user: User) -> None:
-        sql = "INSERT INTO users (id) VALUES (?)"
-        params = (user.id,)
-        await Users._make_request(sql, params)
+        if (entry := language_cache.get("users", user.id)) is not None:
+            language_cache.set("users", user.id, entry._replace(exists=True))
+        write_queue.put("users", user.id)
 
     @staticmethod
     async def get_language(user: User) -> str | None:
-        sql = "SELECT language_code FROM users WHERE id = ?"
-        params = (user.id,)
-        return (await Users._make_request(sql, params, fetch=True) or [None])[0]
+        return (await Users.get_language_entry(user)).language_code
 
     @staticmethod
     async def set_language(user: User, language_code: str) -> None:
-        sql = "UPDATE users SET language_code = ? WHERE id = ?"
-        params = (language_code, user.id)
-        if not await Users.get_user(user=user):
-            sql = "INSERT INTO users (language_code, id) VALUES (?, ?)"
-        await Users._make_request(sql, params)
+        language_cache.set(
+            "users", user.id, LanguageEntry(exists=True, language_code=language_code)
+        )
+        write_queue.put("users", user.id, language_code)
+
+    @staticmethod
+    async def get_language_counts() -> dict[str, int]:
+        return await storage.get_language_counts("users")
 
     @staticmethod
-    async def get_users_count(language_code: str | None = None) -> str | Literal[0]:
-        sql = "SELECT COUNT(*) FROM users"
-        params = ()
-        if language_code:
-            sql += " WHERE language_code = ?"
-            params = (language_code,)
-        r = await Users._make_request(sql, params, fetch=True)
-        return r[0] if r and r[0] else 0
+    async def get_users_count(language_code: str | None = None) -> int:
+        counts = await Users.get_language_counts()
+        return counts.get(language_code, 0) if language_code else sum(counts.values())
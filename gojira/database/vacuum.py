@@ -0,0 +1,25 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import time
+
+from gojira.config import config
+from gojira.utils.logging import log
+
+from .storage import storage
+from .writer import write_queue
+
+
+async def vacuum_loop() -> None:
+    while True:
+        await asyncio.sleep(config.vacuum_interval)
+
+        idle = time.monotonic() - write_queue.last_write
+        if write_queue.size or idle < config.vacuum_idle_time:
+            continue
+
+        try:
+            await storage.vacuum()
+        except Exception:
+            log.error("Error running incremental vacuum!", exc_info=True)
@@ -0,0 +1,118 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import time
+from contextlib import suppress
+
+from gojira.config import config
+from gojira.utils.logging import log
+
+from .backends import TABLES
+from .cache import language_cache
+from .storage import storage
+
+# Longest wait between flushes while the storage keeps failing
+MAX_RETRY_DELAY: float = 30
+
+
+class WriteBehindQueue:
+    """Collect registrations and language changes and commit them in batches."""
+
+    def __init__(self, flush_interval: float, batch_size: int) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: dict[str, dict[int, str | None]] = {table: {} for table in TABLES}
+        self._has_data = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._stopped = asyncio.Event()
+        self.retry_delay: float = 0
+        self.last_write: float = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return sum(len(rows) for rows in self._pending.values())
+
+    @staticmethod
+    def _merge(rows: dict[int, str | None], obj_id: int, language_code: str | None) -> None:
+        # A bare registration must not drop a language queued before it
+        if language_code is not None or obj_id not in rows:
+            rows[obj_id] = language_code
+
+    def put(self, table: str, obj_id: int, language_code: str | None = None) -> None:
+        self._merge(self._pending[table], obj_id, language_code)
+
+        self.last_write = time.monotonic()
+        self._has_data.set()
+        if self.size >= self.batch_size:
+            self._batch_full.set()
+
+    def get_pending(self, table: str, obj_id: int) -> tuple[bool, str | None]:
+        rows = self._pending[table]
+        return obj_id in rows, rows.get(obj_id)
+
+    async def flush(self) -> None:
+        batches = {table: rows for table, rows in self._pending.items() if rows}
+        self._pending = {table: {} for table in TABLES}
+        self._has_data.clear()
+        self._batch_full.clear()
+        if not batches:
+            return
+
+        try:
+            await storage.upsert_languages(batches)
+        except Exception:
+            log.error(
+                "Error flushing write-behind queue!",
+                rows=sum(len(rows) for rows in batches.values()),
+                exc_info=True,
+            )
+            # Keep the rows for the next flush, newer writes take precedence
+            for table, rows in batches.items():
+                for obj_id, language_code in self._pending[table].items():
+                    self._merge(rows, obj_id, language_code)
+                self._pending[table] = rows
+            self._has_data.set()
+            self.retry_delay = min(max(self.retry_delay * 2, self.flush_interval), MAX_RETRY_DELAY)
+            return
+
+        self.retry_delay = 0
+        for table, rows in batches.items():
+            await language_cache.publish(table, *rows)
+
+    async def run(self) -> None:
+        while not self._stopping:
+            await self._has_data.wait()
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+            await self.flush()
+            if self.retry_delay:
+                # Back off while the storage fails instead of retrying every interval
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stopped.wait(), self.retry_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._stopped.clear()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Cancelling could drop a batch that is being written, let the loop finish it
+            self._stopping = True
+            self._stopped.set()
+            self._has_data.set()
+            self._batch_full.set()
+            await self._task
+            self._task = None
+
+        await self.flush()
+
+
+write_queue = WriteBehindQueue(
+    flush_interval=config.write_flush_interval,
+    batch_size=config.write_batch_size,
+)
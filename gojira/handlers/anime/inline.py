@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-import random
 import re
 from contextlib import suppress
 
@@ -17,7 +16,7 @@ from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.utils.markdown import hide_link
 
-from gojira import AniList, bot
+from gojira import AniList, bot, config
 from gojira.utils.language import (
     i18n_anilist_format,
     i18n_anilist_season,
@@ -31,11 +30,11 @@ router = Router(name="anime_inline")
 @router.inline_query(F.query.regexp(r"^!a (?P<query>.+)").as_("match"))
 async def anime_inline(inline: InlineQuery, match: re.Match[str]):
     query = match.group("query")
+    page = int(inline.offset) if inline.offset.isdigit() else 1
 
     results = []
 
-    search_results = []
-    _status, data = await AniList.search("anime", query)
+    _status, data = await AniList.inline_search("anime", query, page=page)
     if not data:
         return
 
@@ -44,16 +43,8 @@ async def anime_inline(inline: InlineQuery, match: re.Match[str]):
     if not search_results:
         return
 
-    for result in search_results:
-        _status, data = await AniList.get("anime", result["id"])
-        if not data:
-            return
-
-        anime = data["data"]["Page"]["media"][0]
-
-        if not anime:
-            continue
-
+    me = await bot.me()
+    for anime in search_results:
         photo: str = ""
         if cover := anime["bannerImage"]:
             photo = cover
@@ -156,12 +147,9 @@ async def anime_inline(inline: InlineQuery, match: re.Match[str]):
         text += f"\n{hide_link(photo)}"
 
         keyboard = InlineKeyboardBuilder()
-
-        me = await bot.get_me()
-        bot_username = me.username
         keyboard.button(
             text=_("👓 View More"),
-            url=f"https://t.me/{bot_username}/?start=anime_{anime["id"]}",
+            url=f"https://t.me/{me.username}/?start=anime_{anime["id"]}",
         )
 
         anime_format = f"| {anime["format"]}" if i18n_anilist_format(anime["format"]) else None
@@ -169,7 +157,7 @@ async def anime_inline(inline: InlineQuery, match: re.Match[str]):
         results.append(
             InlineQueryResultArticle(
                 type=InlineQueryResultType.ARTICLE,
-                id=str(random.getrandbits(64)),
+                id=f"anime_{anime["id"]}",
                 title=f"{anime["title"]["romaji"]} {anime_format}",
                 input_message_content=InputTextMessageContent(message_text=text),
                 reply_markup=keyboard.as_markup(),
@@ -178,6 +166,15 @@ async def anime_inline(inline: InlineQuery, match: re.Match[str]):
             )
         )
 
+    # Telegram asks for the next page with this offset once the user scrolls down
+    has_next_page = data["data"]["Page"]["pageInfo"]["hasNextPage"]
+
     with suppress(TelegramBadRequest):
         if len(results) > 0:
-            await inline.answer(results=results, is_personal=True)
+            await inline.answer(
+                results=results,
+                # captions are localized, so the cache can't be shared between users
+                is_personal=True,
+                cache_time=config.inline_cache_time,
+                next_offset=str(page + 1) if has_next_page else "",
+            )
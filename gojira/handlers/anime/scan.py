@@ -1,24 +1,268 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
+import asyncio
+import hashlib
 from contextlib import suppress
 from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
 
 from aiogram import Router
 from aiogram.enums import ChatType, InputMediaType
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import Command
-from aiogram.types import Document, InputMediaPhoto, Message, Video
+from aiogram.types import (
+    Animation,
+    Document,
+    InputMediaPhoto,
+    Message,
+    PhotoSize,
+    Sticker,
+    Video,
+)
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from gojira import TraceMoe, bot, cache
+from gojira import TraceMoe, bot, cache, config
+from gojira.utils import scan_cache
+from gojira.utils.blobstore import blob_store
 from gojira.utils.callback_data import AnimeCallback
+from gojira.utils.imaging import image_processor
+from gojira.utils.scan_queue import scan_queue
+from gojira.utils.video import frame_extractor
 
 router = Router(name="anime_scan")
 
+# Bot API servers refuse to serve larger files, unless they run in local mode
+MAX_DOWNLOAD_SIZE: int = 20 * 1024**2
+MAX_LOCAL_FILE_SIZE: int = 2000 * 1024**2
+# Images are read into memory to be resized, even from a local Bot API server
+MAX_LOCAL_IMAGE_SIZE: int = 50 * 1024**2
 
-@router.message(Command("scan"))
+# Status of video scans without a single extracted frame, never cached
+UNREADABLE_MEDIA: int = 422
+
+ScanMedia = PhotoSize | Sticker | Animation | Document | Video
+
+
+def is_video(media: ScanMedia) -> bool:
+    if isinstance(media, Animation | Video):
+        return True
+    if isinstance(media, Sticker):
+        return media.is_video
+    if isinstance(media, Document):
+        return bool(media.mime_type and media.mime_type.startswith("video/"))
+    return False
+
+
+def is_image(media: ScanMedia) -> bool:
+    if isinstance(media, PhotoSize):
+        return True
+    if isinstance(media, Sticker):
+        return not (media.is_animated or media.is_video)
+    if isinstance(media, Document):
+        return bool(media.mime_type and media.mime_type.startswith("image/"))
+    return False
+
+
+def aggregate_results(responses: list[dict[str, Any]]) -> dict[str, Any]:
+    """Rank matches from several frames by anime and episode, weighted by similarity."""
+    scores: dict[tuple[int, str], float] = {}
+    best: dict[tuple[int, str], dict[str, Any]] = {}
+    for response in responses:
+        frame_scores: dict[tuple[int, str], float] = {}
+        for result in response["result"]:
+            key = (result["anilist"]["id"], str(result["episode"]))
+            frame_scores[key] = max(frame_scores.get(key, 0), result["similarity"])
+            if key not in best or result["similarity"] > best[key]["similarity"]:
+                best[key] = result
+
+        # Each frame votes once per match, so near-identical results don't stack
+        for key, similarity in frame_scores.items():
+            scores[key] = scores.get(key, 0) + similarity
+
+    ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    return {"result": [best[key] for key in ranked]}
+
+
+async def scan_image(
+    image: memoryview, file_unique_id: str, digest: str
+) -> tuple[int, dict[str, Any]]:
+    # Upload a small JPEG, fall back to the original if Pillow can't decode it
+    image_hash = None
+    if prepared := await image_processor.prepare(image):
+        upload, image_hash = prepared
+        if data := await scan_cache.get_by_hash(image_hash):
+            # Later scans of the same file then skip the download
+            await scan_cache.store(file_unique_id, image_hash, data)
+            return 200, data
+    else:
+        upload = image
+
+    status, data = await TraceMoe.search(file=upload, digest=digest)
+    if status == 200:
+        await scan_cache.store(file_unique_id, image_hash, data)
+    return status, data
+
+
+async def scan_preview(file_unique_id: str, preview: PhotoSize) -> dict[str, Any] | None:
+    """Look near-duplicates up from the small preview, before downloading the full image."""
+    # Only a shortcut, the full download still follows if the preview can't be fetched
+    try:
+        file = await bot.get_file(preview.file_id)
+        if not file or not file.file_path:
+            return None
+        downloaded = await bot.download_file(file.file_path)
+    except TelegramBadRequest:
+        return None
+
+    if not downloaded or not (prepared := await image_processor.prepare(downloaded.read())):
+        return None
+
+    _upload, image_hash = prepared
+    if data := await scan_cache.get_by_hash(image_hash):
+        await scan_cache.store(file_unique_id, None, data)
+    return data
+
+
+async def scan_frame(frame: bytes) -> tuple[int, dict[str, Any]]:
+    prepared = await image_processor.prepare(frame)
+    if not prepared:
+        return 200, {"result": []}
+
+    upload, image_hash = prepared
+    if data := await scan_cache.get_by_hash(image_hash):
+        return 200, data
+
+    status, data = await TraceMoe.search(file=upload, digest=hashlib.sha256(upload).hexdigest())
+    if status == 200:
+        await scan_cache.store(None, image_hash, data)
+    return status, data
+
+
+async def scan_video(path: Path, file_unique_id: str) -> tuple[int, dict[str, Any]]:
+    frames = await frame_extractor.extract(path, config.scan_video_frames)
+    if not frames:
+        # ffmpeg failed or timed out, that's no reason to remember the video has no results
+        return UNREADABLE_MEDIA, {}
+
+    responses = await asyncio.gather(*(scan_frame(frame) for frame in frames))
+
+    results = [data for status, data in responses if status == 200]
+    if not results:
+        # Report rate limiting first, it's the error users can act on
+        statuses = [status for status, _data in responses]
+        return next((code for code in statuses if code in {402, 429}), statuses[0]), {}
+
+    data = aggregate_results(results)
+    await scan_cache.store(file_unique_id, None, data)
+    return 200, data
+
+
+async def show_queue_position(sent: Message, position: int) -> None:
+    caption = (
+        _("Waiting in the scan queue, position {position}...").format(position=position)
+        if position
+        else _("Scanning media...")
+    )
+    with suppress(TelegramBadRequest):
+        await sent.edit_caption(caption=caption)
+
+
+async def local_file_path(media: ScanMedia) -> Path | None:
+    # A local Bot API server stores files where we can read them in place
+    file = await bot.get_file(media.file_id)
+    if not file or not file.file_path:
+        return None
+
+    path = Path(bot.session.api.wrap_local_file.to_local(file.file_path))
+    return path if await asyncio.to_thread(path.is_file) else None
+
+
+async def scan_local_file(
+    media: ScanMedia, sent: Message, *, video_scan: bool
+) -> tuple[int, dict[str, Any]] | None:
+    path = await local_file_path(media)
+    if path is None:
+        await sent.edit_caption(caption=_("File not found."))
+        return None
+
+    if video_scan:
+        return await scan_video(path, media.file_unique_id)
+
+    image = await asyncio.to_thread(path.read_bytes)
+    digest = hashlib.sha256(image).hexdigest()
+    return await scan_image(memoryview(image), media.file_unique_id, digest)
+
+
+async def scan_downloaded_file(
+    media: ScanMedia, sent: Message, *, video_scan: bool
+) -> tuple[int, dict[str, Any]] | None:
+    file_unique_id = media.file_unique_id
+
+    # Redis only keeps a pointer to the downloaded file, the bytes live in the blob store
+    digest = await cache.get(f"file_tmoe:{file_unique_id}")
+    if not digest or not await blob_store.exists(digest):
+        file = await bot.get_file(media.file_id)
+        if not file or not file.file_path:
+            await sent.edit_caption(caption=_("File not found."))
+            return None
+
+        file = await bot.download_file(file.file_path)
+        if not file:
+            await sent.edit_caption(caption=_("Something went wrong while downloading the file."))
+            return None
+
+        digest = await blob_store.put(file.read())
+        await cache.set(f"file_tmoe:{file_unique_id}", digest, expire="1d")
+
+    if video_scan:
+        async with blob_store.path(digest) as path:
+            if path is None:
+                await sent.edit_caption(caption=_("File not found."))
+                return None
+
+            return await scan_video(path, file_unique_id)
+
+    async with blob_store.open(digest) as image:
+        if image is None:
+            await sent.edit_caption(caption=_("File not found."))
+            return None
+
+        return await scan_image(image, file_unique_id, digest)
+
+
+async def fetch_results(
+    media: ScanMedia, sent: Message, *, video_scan: bool
+) -> dict[str, Any] | None:
+    # Another scan of the same media may have finished while this one was queued
+    if data := await scan_cache.get_by_unique_id(media.file_unique_id):
+        return data
+
+    scan_file = scan_local_file if bot.session.api.is_local else scan_downloaded_file
+    result = await scan_file(media, sent, video_scan=video_scan)
+    if result is None:
+        return None
+
+    status, data = result
+    if status in {402, 429}:
+        await sent.edit_caption(caption=_("Excessive use of the API, please try again later."))
+        return None
+    if status == UNREADABLE_MEDIA:
+        await sent.edit_caption(caption=_("Could not read this video, please try again later."))
+        return None
+    if status != 200:
+        await sent.edit_caption(caption=_("The API is unavailable, please try again later."))
+        return None
+
+    return data
+
+
+@router.message(
+    Command("scan"), flags={"throttle": "scan", "deadline": "scan", "chat_order": False}
+)
 async def anime_scan(message: Message):
     user = message.from_user
     if not message or not user:
@@ -34,7 +278,7 @@ async def anime_scan(message: Message):
         await message.reply(_("Reply to a message with a media."))
         return
 
-    media = (
+    media: ScanMedia | None = (
         reply.photo[-1]
         if reply.photo
         else reply.sticker or (reply.animation or (reply.document or (reply.video or None)))
@@ -44,44 +288,48 @@ async def anime_scan(message: Message):
         await message.reply(_("No media was found in this message."))
         return
 
-    if isinstance(media, Document | Video):
-        if media.thumbnail:
-            media = media.thumbnail
-        return
-
-    sent = await message.reply_photo(
-        "https://i.imgur.com/m0N2pFc.jpg", caption="Scanning media..."
+    # ffmpeg reads videos in place from a local Bot API server, any size it serves will do
+    local = bot.session.api.is_local
+    max_video_size = MAX_LOCAL_FILE_SIZE if local else MAX_DOWNLOAD_SIZE
+    max_image_size = MAX_LOCAL_IMAGE_SIZE if local else MAX_DOWNLOAD_SIZE
+    video_scan = (
+        is_video(media) and frame_extractor.available and (media.file_size or 0) <= max_video_size
     )
+    if not video_scan and not (is_image(media) and (media.file_size or 0) <= max_image_size):
+        # Lottie stickers, large files or no ffmpeg, scan the still thumbnail instead
+        thumbnail = None if isinstance(media, PhotoSize) else media.thumbnail
+        if not thumbnail:
+            await message.reply(_("No media was found in this message."))
+            return
+        media = thumbnail
 
-    file_id = media.file_id
-
-    file = await bot.get_file(file_id)
-    if not file or not file.file_path:
-        await sent.edit_caption(caption=_("File not found."))
-        return
-
-    file = await bot.download_file(file.file_path)
-    if not file:
-        await sent.edit_caption(caption=_("Something went wrong while downloading the file."))
-        return
-
-    file_cached = await cache.get(f"file_tmoe:{file_id}")
-
-    file = file_cached or file
-
-    if not file_cached:
-        await cache.set(f"file_tmoe:{file_id}", file, expire="1d")
+    # Images have a small size whose dHash is close enough to look the full one up
+    preview: PhotoSize | None = None
+    if reply.photo:
+        preview = reply.photo[0]
+    elif not isinstance(media, PhotoSize):
+        preview = media.thumbnail
+    if video_scan or (preview and preview.file_unique_id == media.file_unique_id):
+        preview = None
 
-    status, data = await TraceMoe.search(file=file)
+    sent = await message.reply_photo(
+        "https://i.imgur.com/m0N2pFc.jpg", caption=_("Scanning media...")
+    )
 
-    if status == 200:
-        pass
-    elif status == 429:
-        await sent.edit_caption(caption=_("Excessive use of the API, please try again later."))
-        return
-    else:
-        await sent.edit_caption(caption=_("The API is unavailable, please try again later."))
-        return
+    # The same media has the same file_unique_id in every chat, check it before queueing
+    data = await scan_cache.get_by_unique_id(media.file_unique_id)
+    # A local Bot API server reads files in place, there's no download to save
+    if not data and preview and not local:
+        data = await scan_preview(media.file_unique_id, preview)
+    if not data:
+        data = await scan_queue.run(
+            chat_id=message.chat.id,
+            user_id=user.id,
+            func=partial(fetch_results, media, sent, video_scan=video_scan),
+            on_position=partial(show_queue_position, sent),
+        )
+        if not data:
+            return
 
     results = data["result"]
     if len(results) == 0:
@@ -129,7 +377,7 @@ async def anime_scan(message: Message):
 
     if video is not None:
         with suppress(TelegramBadRequest):
-            cached_video = await cache.get(f"trace_moe:{file_id}")
+            cached_video = await cache.get(f"trace_moe:{media.file_unique_id}")
             video = cached_video or f"{video}&size=l"
 
             sent_video = await reply.reply_video(
@@ -149,4 +397,6 @@ async def anime_scan(message: Message):
                 )
 
             if not cached_video and sent_video.video:
-                await cache.set(f"trace_moe:{file_id}", sent_video.video.file_id, expire="1d")
+                await cache.set(
+                    f"trace_moe:{media.file_unique_id}", sent_video.video.file_id, expire="1d"
+                )
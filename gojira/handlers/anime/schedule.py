@@ -12,9 +12,21 @@ from aiogram.utils.markdown import hlink
 
 from gojira import Jikan, bot
 from gojira.utils.callback_data import ScheduleCallback
+from gojira.utils.language import weekdays
 
 router = Router(name="anime_schedule")
 
+# Jikan's day names, indexed like datetime.weekday()
+SCHEDULE_DAYS: tuple[str, ...] = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
 
 @router.message(Command("schedule"))
 @router.callback_query(ScheduleCallback.filter())
@@ -38,21 +50,15 @@ async def anime_schedule(
             return
 
     day = callback_data.day if callback_data else datetime.datetime.now(tz=datetime.UTC).weekday()
-    day_map = {
-        0: ["Monday", _("Monday")],
-        1: ["Tuesday", _("Tuesday")],
-        2: ["Wednesday", _("Wednesday")],
-        3: ["Thursday", _("Thursday")],
-        4: ["Friday", _("Friday")],
-        5: ["Saturday", _("Saturday")],
-        6: ["Sunday", _("Sunday")],
-    }
-    day_name = day_map.get(day, "None")
-    _status, data = await Jikan.schedules(day=day_name[0].lower())
+    if day not in range(len(SCHEDULE_DAYS)):
+        return
+
+    day_names = weekdays.current()
+    _status, data = await Jikan.schedules(day=SCHEDULE_DAYS[day])
     animes = data["data"]
 
     me = await bot.get_me()
-    text = _("Below is the schedule for <b>{day}</b>:\n\n").format(day=day_name[1])
+    text = _("Below is the schedule for <b>{day}</b>:\n\n").format(day=day_names[day])
     for n, anime in enumerate(animes, start=1):
         title = anime["title"]
         malid = anime["mal_id"]
@@ -67,12 +73,12 @@ may not be available on AniList, so the bot won't be able to show information ab
     keyboard = InlineKeyboardBuilder()
     if day > 0:
         keyboard.button(
-            text=f"⬅️ {day_map.get(day - 1, ["None", "None"])[1]}",
+            text=f"⬅️ {day_names[day - 1]}",
             callback_data=ScheduleCallback(user_id=user.id, day=day - 1),
         )
     if day < 6:
         keyboard.button(
-            text=f"➡️ {day_map.get(day + 1, ["None", "None"])[1]}",
+            text=f"➡️ {day_names[day + 1]}",
             callback_data=ScheduleCallback(user_id=user.id, day=day + 1),
         )
 
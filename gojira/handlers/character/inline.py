@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-import random
 import re
 from contextlib import suppress
 
@@ -12,7 +11,7 @@ from aiogram.types import InlineQuery, InlineQueryResultPhoto
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from gojira import AniList, bot
+from gojira import AniList, bot, config
 
 router = Router(name="character_inline")
 
@@ -20,11 +19,11 @@ router = Router(name="character_inline")
 @router.inline_query(F.query.regexp(r"^!c (?P<query>.+)").as_("match"))
 async def character_inline(inline: InlineQuery, match: re.Match[str]):
     query = match.group("query")
+    page = int(inline.offset) if inline.offset.isdigit() else 1
 
     results = []
 
-    search_results = []
-    _status, data = await AniList.search("character", query)
+    _status, data = await AniList.inline_search("character", query, page=page)
     if not data:
         return
 
@@ -33,16 +32,8 @@ async def character_inline(inline: InlineQuery, match: re.Match[str]):
     if not search_results:
         return
 
-    for result in search_results:
-        _status, data = await AniList.get("character", result["id"])
-        if not data:
-            return
-
-        if not data["data"]["Page"]["characters"]:
-            continue
-
-        character = data["data"]["Page"]["characters"][0]
-
+    me = await bot.me()
+    for character in search_results:
         photo: str = ""
         if image := character["image"]:
             if large_image := image["large"]:
@@ -64,18 +55,15 @@ async def character_inline(inline: InlineQuery, match: re.Match[str]):
         text += f"\n\n{description}"
 
         keyboard = InlineKeyboardBuilder()
-
-        me = await bot.get_me()
-        bot_username = me.username
         keyboard.button(
             text=_("👓 View More"),
-            url=f"https://t.me/{bot_username}/?start=character_{character["id"]}",
+            url=f"https://t.me/{me.username}/?start=character_{character["id"]}",
         )
 
         results.append(
             InlineQueryResultPhoto(
                 type=InlineQueryResultType.PHOTO,
-                id=str(random.getrandbits(64)),
+                id=f"character_{character["id"]}",
                 photo_url=photo,
                 thumbnail_url=photo,
                 title=character["name"]["full"],
@@ -86,6 +74,13 @@ async def character_inline(inline: InlineQuery, match: re.Match[str]):
             )
         )
 
+    has_next_page = data["data"]["Page"]["pageInfo"]["hasNextPage"]
+
     with suppress(TelegramBadRequest):
         if len(results) > 0:
-            await inline.answer(results=results, is_personal=True)
+            await inline.answer(
+                results=results,
+                is_personal=True,
+                cache_time=config.inline_cache_time,
+                next_offset=str(page + 1) if has_next_page else "",
+            )
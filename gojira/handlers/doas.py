@@ -21,9 +21,14 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from meval import meval
 
 from gojira import cache, i18n
-from gojira.database import DB_PATH, Chats, Users
+from gojira.database import Chats, Users, storage
 from gojira.filters.users import IsSudo
+from gojira.middlewares.concurrency import dispatch_controller
+from gojira.middlewares.deadline import deadline_middleware
+from gojira.middlewares.startup import startup_timer
 from gojira.utils.callback_data import StartCallback
+from gojira.utils.outbound import send_scheduler
+from gojira.utils.prefork import receiver_pid, restart
 from gojira.utils.systools import ShellExceptionError, parse_commits, shell_run
 
 router = Router(name="doas")
@@ -73,13 +78,13 @@ async def upload_document(message: Message, command: CommandObject):
 @router.message(Command(commands=["reboot", "restart"]))
 async def reboot(message: Message):
     await message.reply("Rebooting...")
-    os.execv(sys.executable, [sys.executable, "-m", "gojira"])
+    restart()
 
 
 @router.message(Command("shutdown"))
 async def shutdown_message(message: Message):
     await message.reply("Turning off...")
-    os.kill(os.getpid(), SIGINT)
+    os.kill(receiver_pid(), SIGINT)
 
 
 @router.message(Command(commands=["update", "upgrade"]))
@@ -140,7 +145,7 @@ async def upgrade_callback(callback: CallbackQuery):
     await sent.reply_document(document=document)
 
     await sent.reply("Restarting...")
-    os.execv(sys.executable, [sys.executable, "-m", "gojira"])
+    restart()
 
 
 @router.message(Command(commands=["shell", "sh"]))
@@ -217,19 +222,35 @@ async def ping(message: Message):
 
 @router.message(Command("stats"))
 async def bot_stats(message: Message):
-    db_size = humanize.naturalsize(Path.stat(DB_PATH).st_size, binary=True)
+    db_size = humanize.naturalsize(await storage.get_size(), binary=True)
     text = f"\n<b>Database Size</b>: <code>{db_size}</code>"
     disk = shutil.disk_usage("/")
     text += f"\n<b>Free Storage</b>: <code>{humanize.naturalsize(disk[2], binary=True)}</code>"
 
-    text += f"\n\n<b>Total Users</b>: <code>{await Users.get_users_count()}</code>"
+    users = await Users.get_language_counts()
+    text += f"\n\n<b>Total Users</b>: <code>{sum(users.values())}</code>"
     for language in (*i18n.available_locales, i18n.default_locale):
-        users = await Users.get_users_count(language_code=language)
-        text += f"\n<b>{language}</b>: <code>{users}</code>"
+        text += f"\n<b>{language}</b>: <code>{users.get(language, 0)}</code>"
 
-    text += f"\n\n<b>Total Groups</b>: <code>{await Chats.get_chats_count()}</code>"
+    groups = await Chats.get_language_counts()
+    text += f"\n\n<b>Total Groups</b>: <code>{sum(groups.values())}</code>"
     for language in (*i18n.available_locales, i18n.default_locale):
-        groups = await Chats.get_chats_count(language_code=language)
-        text += f"\n<b>{language}</b>: <code>{groups}</code>"
+        text += f"\n<b>{language}</b>: <code>{groups.get(language, 0)}</code>"
+
+    text += "\n\n<b>Update Queue</b>"
+    for name, value in dispatch_controller.metrics.items():
+        text += f"\n<b>{name.capitalize()}</b>: <code>{value}</code>"
+
+    text += "\n\n<b>Startup</b>"
+    for name, value in startup_timer.metrics.items():
+        text += f"\n<b>{name.capitalize()}</b>: <code>{value}</code>"
+
+    text += "\n\n<b>Outbound Messages</b>"
+    for name, value in send_scheduler.metrics.items():
+        text += f"\n<b>{name.capitalize()}</b>: <code>{value}</code>"
+
+    text += "\n\n<b>Deadlines Exceeded</b>"
+    for name, value in deadline_middleware.metrics.items():
+        text += f"\n<b>{name.capitalize()}</b>: <code>{value}</code>"
 
     await message.reply(text)
@@ -8,6 +8,7 @@ from aiogram.types import CallbackQuery, ErrorEvent
 
 from gojira import bot, cache
 from gojira.utils.logging import log
+from gojira.utils.outbound import interactive
 
 router = Router(name="error")
 
@@ -52,4 +53,5 @@ async def errors_handler(error: ErrorEvent):
     )
     if not cached_error:
         await cache.set(f"error:{chat_id}", err_msg, "1h")
-    await bot.send_message(chat_id, text)
+    with interactive():
+        await bot.send_message(chat_id, text)
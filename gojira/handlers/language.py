@@ -10,17 +10,21 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from babel import Locale
 
 from gojira import i18n
-from gojira.database import Chats, Users
+from gojira.database import Chats, LanguageEntry, Users
 from gojira.filters.users import IsAdmin
 from gojira.utils.callback_data import LanguageCallback, StartCallback
-from gojira.utils.language import get_chat_language
+from gojira.utils.language import locale_display_name
 
 router = Router(name="language")
 
 
 @router.message(Command("language"), IsAdmin())
 @router.callback_query(StartCallback.filter(F.menu == "language"))
-async def select_language(union: Message | CallbackQuery):
+async def select_language(
+    union: Message | CallbackQuery,
+    user: LanguageEntry | None = None,
+    chat: LanguageEntry | None = None,
+):
     is_callback = isinstance(union, CallbackQuery)
     message = union.message if is_callback else union
     if not message or not union.from_user:
@@ -29,8 +33,10 @@ async def select_language(union: Message | CallbackQuery):
     if isinstance(message, InaccessibleMessage):
         return
 
-    chat_type, lang_code = await get_chat_language(union)
-    lang_display_name = str(Locale.parse(str(lang_code)).display_name).capitalize()
+    chat_type = message.chat.type
+    entry = user if chat_type == ChatType.PRIVATE else chat
+    lang_code = entry.language_code if entry and entry.language_code else i18n.default_locale
+    lang_display_name = locale_display_name(str(lang_code))
 
     text = _(
         "You can select your preferred language for the bot in this chat by clicking one of the \
@@ -46,7 +52,7 @@ not available, you can contribute by contacting @Hitalo to add it for translatio
     available_locales = (*i18n.available_locales, i18n.default_locale)
     keyboard = InlineKeyboardBuilder()
     for lang in available_locales:
-        lang_display_name = str(Locale.parse(lang).display_name).capitalize()
+        lang_display_name = locale_display_name(lang)
         if lang == lang_code:
             lang_display_name = f"✅ {lang_display_name}"
         keyboard.button(
@@ -16,6 +16,7 @@ from gojira.utils.callback_data import (
     StartCallback,
 )
 from gojira.utils.keyboard import Pagination
+from gojira.utils.language import anilist_genres
 
 router = Router(name="manga_categories")
 
@@ -31,26 +32,7 @@ async def manga_categories(callback: CallbackQuery, callback_data: MangaCategCal
 
     page = callback_data.page
 
-    categories: dict = {
-        "Action": _("Action"),
-        "Adventure": _("Adventure"),
-        "Comedy": _("Comedy"),
-        "Drama": _("Drama"),
-        "Ecchi": _("Ecchi"),
-        "Fantasy": _("Fantasy"),
-        "Horror": _("Horror"),
-        "Mahou Shoujo": _("Mahou Shoujo"),
-        "Mecha": _("Mecha"),
-        "Music": _("Music"),
-        "Mystery": _("Mystery"),
-        "Psychological": _("Psychological"),
-        "Romance": _("Romance"),
-        "Sci-Fi": _("Sci-Fi"),
-        "Slice of Life": _("Slice of Life"),
-        "Sports": _("Sports"),
-        "Supernatural": _("Supernatural"),
-        "Thriller": _("Thriller"),
-    }
+    categories = anilist_genres.current()
     categories_list = sorted(categories.keys())
 
     layout = Pagination(
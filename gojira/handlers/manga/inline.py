@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-import random
 import re
 from contextlib import suppress
 
@@ -17,7 +16,7 @@ from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.utils.markdown import hide_link
 
-from gojira import AniList, bot
+from gojira import AniList, bot, config
 from gojira.utils.language import (
     i18n_anilist_format,
     i18n_anilist_source,
@@ -30,11 +29,11 @@ router = Router(name="manga_inline")
 @router.inline_query(F.query.regexp(r"^!m (?P<query>.+)").as_("match"))
 async def manga_inline(inline: InlineQuery, match: re.Match[str]):
     query = match.group("query")
+    page = int(inline.offset) if inline.offset.isdigit() else 1
 
     results = []
 
-    search_results = []
-    _status, data = await AniList.search("manga", query)
+    _status, data = await AniList.inline_search("manga", query, page=page)
     if not data:
         return
 
@@ -43,16 +42,8 @@ async def manga_inline(inline: InlineQuery, match: re.Match[str]):
     if not search_results:
         return
 
-    for result in search_results:
-        _status, data = await AniList.get("manga", result["id"])
-        if not data:
-            return
-
-        if not data["data"]["Page"]["media"]:
-            continue
-
-        manga = data["data"]["Page"]["media"][0]
-
+    me = await bot.me()
+    for manga in search_results:
         photo: str = ""
         if banner := manga["bannerImage"]:
             photo = banner
@@ -135,18 +126,15 @@ async def manga_inline(inline: InlineQuery, match: re.Match[str]):
         text += f"\n{hide_link(photo)}"
 
         keyboard = InlineKeyboardBuilder()
-
-        me = await bot.get_me()
-        bot_username = me.username
         keyboard.button(
             text=_("👓 View More"),
-            url=f"https://t.me/{bot_username}/?start=manga_{manga["id"]}",
+            url=f"https://t.me/{me.username}/?start=manga_{manga["id"]}",
         )
 
         results.append(
             InlineQueryResultArticle(
                 type=InlineQueryResultType.ARTICLE,
-                id=str(random.getrandbits(64)),
+                id=f"manga_{manga["id"]}",
                 title=manga["title"]["romaji"],
                 input_message_content=InputTextMessageContent(message_text=text),
                 reply_markup=keyboard.as_markup(),
@@ -155,6 +143,13 @@ async def manga_inline(inline: InlineQuery, match: re.Match[str]):
             )
         )
 
+    has_next_page = data["data"]["Page"]["pageInfo"]["hasNextPage"]
+
     with suppress(TelegramBadRequest):
         if len(results) > 0:
-            await inline.answer(results=results, is_personal=True)
+            await inline.answer(
+                results=results,
+                is_personal=True,
+                cache_time=config.inline_cache_time,
+                next_offset=str(page + 1) if has_next_page else "",
+            )
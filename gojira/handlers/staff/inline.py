@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-import random
 import re
 from contextlib import suppress
 
@@ -12,7 +11,7 @@ from aiogram.types import InlineQuery, InlineQueryResultPhoto
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from gojira import AniList, bot
+from gojira import AniList, bot, config
 
 router = Router(name="staff_inline")
 
@@ -20,10 +19,11 @@ router = Router(name="staff_inline")
 @router.inline_query(F.query.regexp(r"^!s (?P<query>.+)").as_("match"))
 async def staff_inline(inline: InlineQuery, match: re.Match[str]):
     query = match.group("query")
+    page = int(inline.offset) if inline.offset.isdigit() else 1
 
     results = []
 
-    _status, data = await AniList.search("staff", query)
+    _status, data = await AniList.inline_search("staff", query, page=page)
     if not data:
         return
 
@@ -32,16 +32,8 @@ async def staff_inline(inline: InlineQuery, match: re.Match[str]):
     if not search_results:
         return
 
-    for result in search_results:
-        _status, data = await AniList.get("staff", result["id"])
-        if not data:
-            return
-
-        if not data["data"]["Page"]["staff"]:
-            continue
-
-        staff = data["data"]["Page"]["staff"][0]
-
+    me = await bot.me()
+    for staff in search_results:
         photo: str = ""
         if image := staff["image"]:
             if large_image := image["large"]:
@@ -67,18 +59,15 @@ async def staff_inline(inline: InlineQuery, match: re.Match[str]):
         text += f"\n\n{description}"
 
         keyboard = InlineKeyboardBuilder()
-
-        me = await bot.get_me()
-        bot_username = me.username
         keyboard.button(
             text=_("👓 View More"),
-            url=f"https://t.me/{bot_username}/?start=staff_{staff["id"]}",
+            url=f"https://t.me/{me.username}/?start=staff_{staff["id"]}",
         )
 
         results.append(
             InlineQueryResultPhoto(
                 type=InlineQueryResultType.PHOTO,
-                id=str(random.getrandbits(64)),
+                id=f"staff_{staff["id"]}",
                 photo_url=photo,
                 thumbnail_url=photo,
                 title=staff["name"]["full"],
@@ -89,6 +78,13 @@ async def staff_inline(inline: InlineQuery, match: re.Match[str]):
             )
         )
 
+    has_next_page = data["data"]["Page"]["pageInfo"]["hasNextPage"]
+
     with suppress(TelegramBadRequest):
         if len(results) > 0:
-            await inline.answer(results=results, is_personal=True)
+            await inline.answer(
+                results=results,
+                is_personal=True,
+                cache_time=config.inline_cache_time,
+                next_offset=str(page + 1) if has_next_page else "",
+            )
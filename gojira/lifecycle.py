@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import signal
+from contextlib import suppress
+from multiprocessing.queues import Queue
+
+import sentry_sdk
+from sentry_sdk.integrations.aiohttp import AioHttpIntegration
+from sentry_sdk.integrations.redis import RedisIntegration
+
+from gojira import AniList, Jikan, TraceMoe, bot, config, dp, i18n
+from gojira.database import language_cache, storage, vacuum_loop, write_queue
+from gojira.handlers import load_modules
+from gojira.middlewares.coalescer import CallbackCoalescer
+from gojira.middlewares.concurrency import dispatch_controller
+from gojira.middlewares.context import ContextMiddleware
+from gojira.middlewares.deadline import deadline_middleware
+from gojira.middlewares.inline import InlineCoordinator
+from gojira.middlewares.startup import startup_timer
+from gojira.middlewares.throttling import ThrottlingMiddleware
+from gojira.utils.imaging import image_processor
+from gojira.utils.logging import log
+from gojira.utils.outbound import send_scheduler
+from gojira.utils.prefork import WorkerMetrics, consume_updates
+
+
+async def setup_storage() -> list[asyncio.Task]:
+    # in prefork mode only the receiver migrates and vacuums, workers just open the storage
+    await storage.setup()
+    await storage.migrate()
+    return [asyncio.create_task(vacuum_loop())]
+
+
+async def setup(*, worker: bool = False) -> list[asyncio.Task]:
+    log.info("Using cache backend.", backend=config.cache_backend)
+
+    # the bot user is needed to start receiving updates, fetch it during migrations
+    if worker:
+        background_tasks = []
+        await asyncio.gather(storage.setup(), bot.me())
+    else:
+        background_tasks, _ = await asyncio.gather(setup_storage(), bot.me())
+    write_queue.start()
+
+    # keep language caches of every instance coherent
+    if config.cache_backend == "redis":
+        background_tasks.append(
+            asyncio.create_task(language_cache.listen(f"redis://{config.redis_host}"))
+        )
+
+    if config.sentry_url:
+        log.info("Starting sentry.io integraion.")
+
+        sentry_sdk.init(
+            str(config.sentry_url),
+            traces_sample_rate=1.0,
+            integrations=[RedisIntegration(), AioHttpIntegration()],
+        )
+
+    dp.update.outer_middleware(startup_timer)
+
+    # pace outgoing messages below Telegram's flood limits
+    bot.session.middleware(send_scheduler)
+
+    # superseded inline queries are dropped before being throttled or queued
+    dp.update.outer_middleware(InlineCoordinator(debounce=config.inline_debounce))
+
+    # flooding users are turned away before they take a chat lock or a slot,
+    # only by local counts, waiting for Redis here could reorder a chat's updates
+    throttling_middleware = ThrottlingMiddleware(
+        i18n=i18n,
+        rates=config.throttle_rates,
+        window=config.throttle_window,
+        local_share=config.throttle_local_share,
+    )
+    dp.update.outer_middleware(throttling_middleware)
+
+    # clicks are noted on arrival, before they wait for their chat's turn
+    callback_coalescer = CallbackCoalescer()
+    dp.update.outer_middleware(callback_coalescer)
+    dp.update.outer_middleware(dispatch_controller)
+    dp.callback_query.outer_middleware(callback_coalescer)
+
+    # long handlers let the next updates of their chat start
+    dp.message.middleware(dispatch_controller)
+    dp.callback_query.middleware(dispatch_controller)
+
+    # the deadline covers everything after it, the context's database lookups included
+    dp.message.middleware(deadline_middleware)
+    dp.callback_query.middleware(deadline_middleware)
+    dp.inline_query.middleware(deadline_middleware)
+
+    # the shared counts and handlers' stricter classes are checked in the chat's turn,
+    # before any database work
+    dp.message.middleware(throttling_middleware)
+    dp.callback_query.middleware(throttling_middleware)
+    dp.inline_query.middleware(throttling_middleware)
+
+    context_middleware = ContextMiddleware(i18n=i18n)
+    dp.message.middleware(context_middleware)
+    dp.callback_query.middleware(context_middleware)
+    dp.inline_query.middleware(context_middleware)
+
+    load_modules(dp)
+    return background_tasks
+
+
+async def teardown(background_tasks: list[asyncio.Task]) -> None:
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # commit pending registrations and language changes
+    log.info("Flushing database writes.")
+    await write_queue.stop()
+    await storage.close()
+
+    # close aiohttp connections
+    log.info("Closing aiohttp connections.")
+    await AniList.close()
+    await Jikan.close()
+    await TraceMoe.close()
+
+    # stop image preprocessing workers
+    image_processor.shutdown()
+
+
+async def publish_metrics(metrics: WorkerMetrics, index: int) -> None:
+    while True:
+        metrics.publish(index, dispatch_controller.metrics)
+        await asyncio.sleep(1)
+
+
+async def run_worker(updates: Queue, metrics: WorkerMetrics, index: int) -> None:
+    background_tasks = await setup(worker=True)
+    startup_timer.mark_ready()
+    # the receiver answers health checks, it only sees what workers publish
+    background_tasks.append(asyncio.create_task(publish_metrics(metrics, index)))
+    try:
+        await consume_updates(dp, bot, updates)
+    finally:
+        await teardown(background_tasks)
+        await bot.session.close()
+
+
+def worker(updates: Queue, metrics: WorkerMetrics, index: int) -> None:
+    # spawned processes can't find targets defined in __main__, so it lives here
+    # the receiver stops workers through the queue, after the last update
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    asyncio.run(run_worker(updates, metrics, index))
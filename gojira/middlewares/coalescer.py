@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, TelegramObject, Update
+
+MessageKey = tuple[int, int] | str
+ClickKey = tuple[MessageKey, int, str]
+
+
+def message_key(callback: CallbackQuery) -> MessageKey | None:
+    if callback.message:
+        return callback.message.chat.id, callback.message.message_id
+    return callback.inline_message_id
+
+
+def click_key(callback: CallbackQuery) -> ClickKey | None:
+    # Only the same user clicking the same kind of button replaces a click, so
+    # someone else's click or a different action on the message is never dropped
+    message = message_key(callback)
+    if not message or callback.data is None:
+        return None
+    return message, callback.from_user.id, callback.data.split(":", 1)[0]
+
+
+class CallbackCoalescer(BaseMiddleware):
+    """Only process the latest of a user's clicks on the same kind of button of a message.
+
+    Registered twice: as an outer middleware of ``dp.update`` before the dispatch
+    controller, to note every click as soon as it arrives, and as an outer middleware
+    of ``dp.callback_query``, which runs once the chat's turn comes. A click still
+    waiting for its turn is answered as soon as a newer one arrives and is never rendered.
+    """
+
+    def __init__(self) -> None:
+        self._waiting: dict[ClickKey, CallbackQuery] = {}
+        self._superseded: set[str] = set()
+        self.coalesced = 0
+
+    async def _track(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = event.callback_query
+        if not callback or not (key := click_key(callback)):
+            return await handler(event, data)
+
+        if (previous := self._waiting.get(key)) is not None:
+            # Stop the spinner of the older click now rather than once its turn comes
+            self._superseded.add(previous.id)
+            self.coalesced += 1
+            with suppress(TelegramBadRequest):
+                await previous.answer()
+
+        self._waiting[key] = callback
+        try:
+            return await handler(event, data)
+        finally:
+            self._superseded.discard(callback.id)
+            if (waiting := self._waiting.get(key)) and waiting.id == callback.id:
+                del self._waiting[key]
+
+    async def _coalesce(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: dict[str, Any],
+    ) -> Any:
+        if event.id in self._superseded:
+            return UNHANDLED
+
+        # Once it's being handled a newer click must not answer it
+        key = click_key(event)
+        if key and (waiting := self._waiting.get(key)) and waiting.id == event.id:
+            del self._waiting[key]
+
+        return await handler(event, data)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            return await self._track(handler, event, data)
+        if isinstance(event, CallbackQuery):
+            return await self._coalesce(handler, event, data)
+        return await handler(event, data)
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import Chat, TelegramObject, Update
+
+from gojira.config import config
+from gojira.utils.logging import log
+
+# Nobody waits for these, an answer after a few seconds is worthless
+LOW_VALUE_UPDATES: frozenset[str] = frozenset({"inline_query", "chosen_inline_result"})
+
+
+class DispatchController(BaseMiddleware):
+    """Bound concurrent updates, keep each chat's updates in order and shed the excess.
+
+    Updates past ``queue_size`` waiting ones are shed, inline queries also once stale.
+
+    Registered as an outer middleware of ``dp.update``. Registered as a middleware
+    of other events too, handlers with ``flags={"chat_order": False}`` give their
+    chat and their concurrency slot back as soon as they start, instead of once
+    they're done. They're meant for long work bounded elsewhere, e.g. the scan queue.
+    """
+
+    def __init__(self, concurrency: int, queue_size: int, inline_max_age: float) -> None:
+        self.queue_size = queue_size
+        self.inline_max_age = inline_max_age
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._chat_locks: dict[int, asyncio.Lock] = {}
+        self._chat_holders: dict[int, int] = {}
+        self.waiting = 0
+        self.active = 0
+        self.shed = 0
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {"waiting": self.waiting, "active": self.active, "shed": self.shed}
+
+    @asynccontextmanager
+    async def _chat_lock(self, chat_id: int) -> AsyncGenerator[None, None]:
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        self._chat_holders[chat_id] = self._chat_holders.get(chat_id, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            if (holders := self._chat_holders[chat_id] - 1) > 0:
+                self._chat_holders[chat_id] = holders
+            else:
+                del self._chat_holders[chat_id]
+                del self._chat_locks[chat_id]
+
+    async def _shed(self, event: Update) -> Any:
+        self.shed += 1
+        log.debug("Shed update.", update_type=event.event_type, waiting=self.waiting)
+        if event.callback_query:
+            # Don't leave the button spinning until Telegram gives up
+            with suppress(TelegramAPIError):
+                await event.callback_query.answer()
+        return UNHANDLED
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            if not get_flag(data, "chat_order", default=True) and (
+                release := data.get("release_update")
+            ):
+                await release()
+            return await handler(event, data)
+
+        # Past the queue bound nothing else is taken in, whatever its type
+        low_value = event.event_type in LOW_VALUE_UPDATES
+        if self.waiting >= self.queue_size:
+            return await self._shed(event)
+
+        received = time.monotonic()
+        chat: Chat | None = data.get("event_chat")
+        async with AsyncExitStack() as chat_order, AsyncExitStack() as stack:
+            self.waiting += 1
+            try:
+                # Wait for the chat first, so queued updates of a busy chat hold no global slot
+                if chat:
+                    await chat_order.enter_async_context(self._chat_lock(chat.id))
+                await stack.enter_async_context(self._semaphore)
+            finally:
+                self.waiting -= 1
+
+            if low_value and time.monotonic() - received > self.inline_max_age:
+                return await self._shed(event)
+
+            released = False
+
+            async def release() -> None:
+                nonlocal released
+                if released:
+                    return
+                released = True
+                self.active -= 1
+                await stack.aclose()
+                await chat_order.aclose()
+
+            data["release_update"] = release
+            self.active += 1
+            try:
+                return await handler(event, data)
+            finally:
+                await release()
+
+
+dispatch_controller = DispatchController(
+    concurrency=config.dispatch_concurrency,
+    queue_size=config.dispatch_queue_size,
+    inline_max_age=config.dispatch_inline_max_age,
+)
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+
+from aiogram.enums import ChatType
+from aiogram.types import Chat, TelegramObject, User
+from aiogram.utils.i18n import I18nMiddleware
+from babel import Locale, UnknownLocaleError
+
+from gojira.database import Chats, LanguageEntry, StorageError, Users
+from gojira.utils.logging import log
+
+
+class ContextMiddleware(I18nMiddleware):
+    """Resolve the user and chat records once per update for both ACL and locale selection.
+
+    The records are exposed to handlers as ``user`` and ``chat``.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        chat: Chat | None = data.get("event_chat")
+
+        data["user"] = await self.resolve_user(user, chat) if user and not user.is_bot else None
+        data["chat"] = await self.resolve_chat(chat) if chat else None
+
+        return await super().__call__(handler, event, data)
+
+    async def resolve_user(self, user: User, chat: Chat | None) -> LanguageEntry | None:
+        try:
+            userdb = await Users.get_language_entry(user=user)
+        except StorageError:
+            # Registering now could overwrite a stored language we just failed to read
+            log.warning("Could not read user language, skipping registration.", user_id=user.id)
+            return None
+
+        if userdb.exists or not chat or chat.type != ChatType.PRIVATE:
+            return userdb
+
+        locale = self.i18n.default_locale
+        if user.language_code:
+            try:
+                locale = str(Locale.parse(user.language_code, sep="-"))
+                if locale not in self.i18n.available_locales:
+                    locale = self.i18n.default_locale
+            except UnknownLocaleError:
+                locale = self.i18n.default_locale
+
+        await Users.set_language(user=user, language_code=locale)
+        return LanguageEntry(exists=True, language_code=locale)
+
+    async def resolve_chat(self, chat: Chat) -> LanguageEntry | None:
+        try:
+            chatdb = await Chats.get_language_entry(chat=chat)
+        except StorageError:
+            log.warning("Could not read chat language, skipping registration.", chat_id=chat.id)
+            return None
+
+        if chatdb.exists or chat.type not in {ChatType.GROUP, ChatType.SUPERGROUP}:
+            return chatdb
+
+        await Chats.set_language(chat=chat, language_code=self.i18n.default_locale)
+        return LanguageEntry(exists=True, language_code=self.i18n.default_locale)
+
+    async def get_locale(self, event: TelegramObject, data: dict[str, Any]) -> str:
+        chat: Chat | None = data.get("event_chat")
+        if not data.get("event_from_user") or not chat:
+            return self.i18n.default_locale
+
+        entry: LanguageEntry | None = data["user" if chat.type == ChatType.PRIVATE else "chat"]
+        if not entry or not entry.exists:
+            return self.i18n.default_locale
+
+        if entry.language_code not in self.i18n.available_locales:
+            return self.i18n.default_locale
+
+        return cast(str, entry.language_code)
@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineQuery, Message, TelegramObject, User
+from aiogram.utils.i18n import I18n
+from aiogram.utils.i18n import gettext as _
+
+from gojira import i18n
+from gojira.config import config
+from gojira.middlewares.throttling import UPDATE_CLASSES
+from gojira.utils.deadline import DeadlineExceededError, bounded, deadline
+from gojira.utils.language import get_cached_locale
+from gojira.utils.logging import log
+from gojira.utils.outbound import interactive
+
+
+class DeadlineMiddleware(BaseMiddleware):
+    """Give each update a time budget, cancelling its handler once it runs out.
+
+    The deadline is carried in a context variable, so HTTP, Redis and database
+    calls made by the handler stop waiting too. Handlers can pick another budget
+    with ``flags={"deadline": "<name>"}``.
+    """
+
+    def __init__(self, i18n: I18n, budgets: dict[str, float]) -> None:
+        self.i18n = i18n
+        self.budgets = budgets
+        self.exceeded: Counter[str] = Counter()
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        return {name: self.exceeded[name] for name in self.budgets}
+
+    async def _fallback(self, event: TelegramObject, user: User | None) -> None:
+        locale = get_cached_locale(self.i18n, user) if user else self.i18n.default_locale
+        with self.i18n.context(), self.i18n.use_locale(locale):
+            text = _("This is taking too long, please try again later.")
+
+        # Someone is still waiting for this reply, even though the deadline is gone
+        with suppress(TelegramBadRequest), interactive():
+            if isinstance(event, CallbackQuery):
+                await event.answer(text)
+            elif isinstance(event, InlineQuery):
+                await event.answer([], cache_time=0, is_personal=True)
+            elif isinstance(event, Message):
+                await event.reply(text)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        name = get_flag(data, "deadline") or UPDATE_CLASSES.get(type(event))
+        if not name or name not in self.budgets:
+            return await handler(event, data)
+
+        try:
+            with deadline(self.budgets[name]):
+                async with bounded():
+                    return await handler(event, data)
+        except DeadlineExceededError:
+            self.exceeded[name] += 1
+            log.warning("Update exceeded its deadline.", name=name, budget=self.budgets[name])
+
+        await self._fallback(event, data.get("event_from_user"))
+        return None
+
+
+deadline_middleware = DeadlineMiddleware(i18n=i18n, budgets=config.deadline_budgets)
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import TelegramObject, Update
+
+
+class InlineCoordinator(BaseMiddleware):
+    """Only let the latest inline query of each user run.
+
+    Telegram sends a query for almost every typed character, so a new query
+    cancels the one it supersedes, after an optional debounce.
+
+    Registered as an outer middleware of ``dp.update`` before the throttling and
+    the dispatch controller, so queries being debounced are neither counted nor
+    hold a concurrency slot.
+    """
+
+    def __init__(self, debounce: float) -> None:
+        self.debounce = debounce
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    async def _run(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if self.debounce:
+            await asyncio.sleep(self.debounce)
+        return await handler(event, data)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update) or not event.inline_query:
+            return await handler(event, data)
+
+        user_id = event.inline_query.from_user.id
+        task = asyncio.create_task(self._run(handler, event, data))
+        if previous := self._tasks.get(user_id):
+            previous.cancel()
+        self._tasks[user_id] = task
+
+        try:
+            return await task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            # Superseded by a newer query, not cancelled from outside
+            if task.cancelled() and current and not current.cancelling():
+                return UNHANDLED
+            raise
+        finally:
+            if self._tasks.get(user_id) is task:
+                del self._tasks[user_id]
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import os
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from gojira.utils.logging import log
+
+# Fallback for systems without procfs, misses only the imports before this module
+IMPORTED_AT: float = time.monotonic()
+
+
+def process_age() -> float:
+    """Seconds since the process started, interpreter startup and imports included."""
+    with suppress(OSError, ValueError, IndexError):
+        # starttime is the 22nd field, counted in clock ticks since boot
+        stat = Path("/proc/self/stat").read_text(encoding="ascii")
+        start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+        uptime = float(Path("/proc/uptime").read_text(encoding="ascii").split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    return time.monotonic() - IMPORTED_AT
+
+
+class StartupTimer(BaseMiddleware):
+    """Measure the time to get ready and to receive the first update.
+
+    Registered as an outer middleware of ``dp.update``.
+    """
+
+    def __init__(self) -> None:
+        self.ready: float | None = None
+        self.first_update: float | None = None
+
+    @property
+    def metrics(self) -> dict[str, str]:
+        return {
+            name: "-" if value is None else f"{value:.2f}s"
+            for name, value in (("ready", self.ready), ("first update", self.first_update))
+        }
+
+    def mark_ready(self) -> None:
+        self.ready = process_age()
+        log.info("Ready to receive updates.", seconds=round(self.ready, 2))
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if self.first_update is None:
+            self.first_update = process_age()
+            log.info("Received the first update.", seconds=round(self.first_update, 2))
+        return await handler(event, data)
+
+
+startup_timer = StartupTimer()
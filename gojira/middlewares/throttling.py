@@ -0,0 +1,145 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, InlineQuery, Message, TelegramObject, Update, User
+from aiogram.utils.i18n import I18n
+from aiogram.utils.i18n import gettext as _
+
+from gojira import cache
+from gojira.config import config
+from gojira.utils.language import get_cached_locale
+
+UPDATE_CLASSES: dict[type[TelegramObject], str] = {
+    Message: "message",
+    CallbackQuery: "callback",
+    InlineQuery: "inline",
+}
+
+
+@dataclass(slots=True)
+class Window:
+    index: int
+    current: int = 0
+    previous: int = 0
+    # hits not yet added to the shared counter
+    pending: int = 0
+    warned: bool = False
+
+    def roll(self, index: int) -> None:
+        if index == self.index:
+            return
+
+        self.previous = self.current if index == self.index + 1 else 0
+        self.current = 0
+        self.pending = 0
+        self.index = index
+        self.warned = False
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Per-user sliding window rate limit for each update class.
+
+    Counts are kept in-process and only pushed to the shared cache once a user
+    gets close to the limit, so regular users never wait for Redis. Handlers can
+    pick a stricter class with ``flags={"throttle": "<name>"}``.
+
+    Registered as an outer middleware of ``dp.update`` before the dispatch
+    controller, so a flooding user never takes a chat lock or a slot. Waiting for
+    Redis there could reorder a chat's updates, so that pass only counts and checks
+    the local estimate. It's also registered as a middleware of the events, before
+    the context middleware, to check the shared counter once the chat's turn comes
+    and the stricter classes, which are only known once a handler matches.
+    """
+
+    def __init__(
+        self, i18n: I18n, rates: dict[str, int], window: float, local_share: float
+    ) -> None:
+        self.i18n = i18n
+        self.rates = rates
+        self.window = window
+        self.local_share = local_share
+        self.shared = config.cache_backend == "redis"
+        self._windows: dict[tuple[str, int], Window] = {}
+        self._index = 0
+
+    def _get_window(self, name: str, user_id: int, index: int) -> Window:
+        if index != self._index:
+            # Windows older than the previous one no longer count
+            self._windows = {
+                key: window for key, window in self._windows.items() if window.index >= index - 1
+            }
+            self._index = index
+
+        window = self._windows.setdefault((name, user_id), Window(index))
+        window.roll(index)
+        return window
+
+    async def _estimate(
+        self, name: str, user_id: int, window: Window, elapsed: float, *, shared: bool
+    ) -> float:
+        local = window.previous * (1 - elapsed) + window.current
+        limit = self.rates[name]
+        if not shared or local < limit * self.local_share or local > limit:
+            return local
+
+        key = f"throttle:{name}:{user_id}"
+        current = await cache.incr(f"{key}:{window.index}", window.pending, expire=self.window * 2)
+        window.pending = 0
+        previous = await cache.get(f"{key}:{window.index - 1}") or 0
+        return max(local, previous * (1 - elapsed) + current)
+
+    async def _reject(self, event: TelegramObject, user: User, window: Window) -> None:
+        with self.i18n.context(), self.i18n.use_locale(get_cached_locale(self.i18n, user)):
+            text = _("You're going too fast, please wait a moment.")
+
+        # Telegram would keep showing a cached rejection after the window reopens
+        if isinstance(event, CallbackQuery):
+            await event.answer(text, show_alert=not window.warned, cache_time=0)
+        elif isinstance(event, InlineQuery):
+            await event.answer([], cache_time=0, is_personal=True)
+        elif isinstance(event, Message) and not window.warned:
+            await event.reply(text)
+        window.warned = True
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        user: User | None = data.get("event_from_user")
+        if isinstance(event, Update):
+            # Counted on arrival, without waiting for the shared counter
+            target, count, shared = event.event, True, False
+            name = UPDATE_CLASSES.get(type(target))
+        elif flag := get_flag(data, "throttle"):
+            target, name, count, shared = event, flag, True, self.shared
+        else:
+            # Already counted on arrival, only the shared counter is left to check
+            target, count, shared = event, False, self.shared
+            name = UPDATE_CLASSES.get(type(event))
+        if not user or not name or name not in self.rates or not (count or shared):
+            return await handler(event, data)
+
+        now = time.time()
+        index, elapsed = divmod(now, self.window)
+        window = self._get_window(name, user.id, int(index))
+        if count:
+            window.current += 1
+            window.pending += 1
+
+        estimate = await self._estimate(
+            name, user.id, window, elapsed / self.window, shared=shared
+        )
+        if estimate > self.rates[name]:
+            await self._reject(target, user, window)
+            return None
+
+        return await handler(event, data)
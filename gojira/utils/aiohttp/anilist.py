@@ -1,23 +1,28 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from typing import Any
+from typing import Any, override
 
 from gojira import cache
+from gojira.config import config
 from gojira.utils.graphql import (
     AIRING_QUERY,
     ANIME_GET,
+    ANIME_INLINE_SEARCH,
     ANIME_SEARCH,
     CATEGORIE_QUERY,
     CHARACTER_GET,
+    CHARACTER_INLINE_SEARCH,
     CHARACTER_POPULAR_QUERY,
     CHARACTER_QUERY,
     CHARACTER_SEARCH,
     DESCRIPTION_QUERY,
     MANGA_GET,
+    MANGA_INLINE_SEARCH,
     MANGA_SEARCH,
     POPULAR_QUERY,
     STAFF_GET,
+    STAFF_INLINE_SEARCH,
     STAFF_POPULAR_QUERY,
     STAFF_QUERY,
     STAFF_SEARCH,
@@ -36,11 +41,27 @@ from gojira.utils.graphql import (
 
 from .client import AiohttpBaseClient
 
+# Search queries that already carry every field an inline result shows
+INLINE_SEARCH_QUERIES: dict[str, str] = {
+    "anime": ANIME_INLINE_SEARCH,
+    "manga": MANGA_INLINE_SEARCH,
+    "character": CHARACTER_INLINE_SEARCH,
+    "staff": STAFF_INLINE_SEARCH,
+}
+
 
 class AniListClient(AiohttpBaseClient):
     def __init__(self) -> None:
         self.base_url: str = "https://graphql.anilist.co"
-        super().__init__(base_url=self.base_url)
+        super().__init__(base_url=self.base_url, hedge_budget=config.anilist_hedge_budget)
+
+    @staticmethod
+    @override
+    def _is_idempotent(method: str, json: dict | None) -> bool:
+        # GraphQL queries only read, unlike mutations
+        query: str = (json or {}).get("query", "")
+        is_query = query.lstrip().startswith(("query", "{"))
+        return is_query or AiohttpBaseClient._is_idempotent(method, json)
 
     @cache(ttl="1h")
     async def search(
@@ -114,6 +135,27 @@ class AniListClient(AiohttpBaseClient):
             )
         return None, None
 
+    @cache(ttl="1h")
+    async def inline_search(
+        self, media: str, query: str, page: int = 1, per_page: int = 10
+    ) -> tuple[int, dict[str, Any]] | tuple[None, None]:
+        # One request per page, the search already has every field the inline results show
+        if (search_query := INLINE_SEARCH_QUERIES.get(media.lower())) is None:
+            return None, None
+
+        return await self._make_request(
+            "POST",
+            url="/",
+            json={
+                "query": search_query,
+                "variables": {
+                    "search": query,
+                    "page": page,
+                    "per_page": per_page,
+                },
+            },
+        )
+
     @cache(ttl="1h")
     async def get(
         self, media: str, media_id: int, mal: bool = False
@@ -3,26 +3,81 @@
 
 import asyncio
 import ssl
-from collections.abc import Callable
+import statistics
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 import backoff
 import orjson
-from aiohttp import ClientError, ClientSession, TCPConnector
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 from yarl import URL
 
+from gojira.utils.deadline import DeadlineExceededError, remaining
 from gojira.utils.logging import log
 
 _JsonLoads = Callable[..., Any]
 _JsonDumps = Callable[..., str]
 
+# Unused hedge tokens stop accumulating here, so a quiet period can't fund a burst
+MAX_HEDGE_TOKENS: float = 10
+
+# aiohttp waits five minutes by default, a hung request would hold its update that long
+DEFAULT_TIMEOUT: float = 30
+
+
+def is_retryable(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class HedgePolicy:
+    """Decide when a slow idempotent request gets a second, identical copy.
+
+    The copy is sent once the first request outlives the p90 of recent
+    latencies. Every request earns ``budget`` tokens and every copy spends one,
+    so copies stay under that share of the requests.
+    """
+
+    def __init__(self, budget: float, samples: int = 100, min_samples: int = 20) -> None:
+        self.budget = budget
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=samples)
+        self._tokens: float = 0
+        self.hedged = 0
+        self.won = 0
+
+    @property
+    def delay(self) -> float | None:
+        if len(self._latencies) < self.min_samples:
+            return None
+        return statistics.quantiles(self._latencies, n=10)[-1]
+
+    def observe(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    def earn(self) -> None:
+        self._tokens = min(self._tokens + self.budget, MAX_HEDGE_TOKENS)
+
+    def spend(self) -> bool:
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
 
 class AiohttpBaseClient:
-    def __init__(self, base_url: str | URL) -> None:
+    def __init__(
+        self, base_url: str | URL, hedge_budget: float = 0, timeout: float = DEFAULT_TIMEOUT
+    ) -> None:
         self._base_url = base_url
+        self.timeout = timeout
         self._session: ClientSession | None = None
         self.json_loads: _JsonLoads = orjson.loads
         self.json_dumps: _JsonDumps = lambda obj: orjson.dumps(obj).decode()
+        self.hedging = HedgePolicy(hedge_budget) if hedge_budget > 0 else None
 
     async def _get_session(self) -> ClientSession:
         if self._session is None:
@@ -32,10 +87,15 @@ class AiohttpBaseClient:
                 base_url=self._base_url,
                 connector=connector,
                 json_serialize=self.json_dumps,
+                timeout=ClientTimeout(total=self.timeout),
             )
 
         return self._session
 
+    @staticmethod
+    def _is_idempotent(method: str, json: dict | None) -> bool:
+        return method in {"GET", "HEAD"}
+
     @backoff.on_exception(backoff.expo, ClientError, max_tries=2)
     async def _make_request(
         self,
@@ -44,6 +104,46 @@ class AiohttpBaseClient:
         params: dict | None = None,
         json: dict | None = None,
         data: dict | None = None,
+    ) -> tuple[int, dict[str, Any]]:
+        request = partial(self._send, method, url, params, json, data)
+        if self.hedging is None or not self._is_idempotent(method, json):
+            return await request()
+        return await self._hedged(self.hedging, request)
+
+    @staticmethod
+    async def _hedged(
+        policy: HedgePolicy, request: Callable[[], Awaitable[tuple[int, dict[str, Any]]]]
+    ) -> tuple[int, dict[str, Any]]:
+        policy.earn()
+        first = asyncio.ensure_future(request())
+        tasks = {first}
+        try:
+            done, _pending = await asyncio.wait(tasks, timeout=policy.delay)
+            if not done and policy.spend():
+                log.debug("AIOHTTP: Hedging slow request.", delay=policy.delay)
+                tasks.add(asyncio.ensure_future(request()))
+
+            # The first answer wins, an error or a 429/5xx only counts once both copies failed
+            while True:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and not is_retryable(task.result()[0]):
+                        policy.won += task is not first
+                        return task.result()
+                    failed = task
+                if not tasks:
+                    return failed.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(
+        self,
+        method: str,
+        url: str | URL,
+        params: dict | None,
+        json: dict | None,
+        data: dict | None,
     ) -> tuple[int, dict[str, Any]]:
         session = await self._get_session()
 
@@ -54,9 +154,33 @@ class AiohttpBaseClient:
             json=json,
             params=params,
         )
-        async with session.request(method, url, params=params, json=json, data=data) as response:
-            status = response.status
-            result = await response.json(loads=self.json_loads)
+        # Give up with the update handling it, if that comes before the session's timeout
+        timeout = session.timeout
+        if (left := remaining()) is not None:
+            if left <= 0:
+                raise DeadlineExceededError
+            if left < self.timeout:
+                timeout = ClientTimeout(total=left)
+
+        start = time.monotonic()
+        try:
+            async with session.request(
+                method, url, params=params, json=json, data=data, timeout=timeout
+            ) as response:
+                status = response.status
+                result = await response.json(loads=self.json_loads)
+        except TimeoutError as error:
+            if timeout is not session.timeout:
+                raise DeadlineExceededError from error
+            raise
+        except asyncio.CancelledError:
+            # Hedge losers are cancelled, leaving them out would drag the p90 down
+            if self.hedging is not None:
+                self.hedging.observe(time.monotonic() - start)
+            raise
+
+        if self.hedging is not None:
+            self.hedging.observe(time.monotonic() - start)
 
         log.debug(
             "AIOHTTP: Got response.",
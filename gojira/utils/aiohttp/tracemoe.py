@@ -1,22 +1,85 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
+import asyncio
+import time
 from typing import Any, BinaryIO
 
+from aiohttp import ClientError
+
 from gojira import cache
+from gojira.config import config
+from gojira.utils.logging import log
 
 from .client import AiohttpBaseClient
 
 
+def is_success(result: tuple[int, dict[str, Any]], *args: Any, **kwargs: Any) -> bool:
+    # Rate limits and quota errors must not stick to the image for an hour
+    return result[0] == 200
+
+
 class TraceMoeClient(AiohttpBaseClient):
     def __init__(self) -> None:
-        self.base_url: str = "https://api.trace.moe"
+        self.base_url: str = config.trace_moe_url
         super().__init__(base_url=self.base_url)
+        # trace.moe limits concurrent searches per IP/key
+        self._semaphore = asyncio.Semaphore(config.trace_moe_concurrency)
+        self._quota_lock = asyncio.Lock()
+        self._quota: int | None = None
+        self._quota_checked: float = 0
+
+    async def me(self) -> tuple[int, dict[str, Any]]:
+        return await self._make_request(method="GET", url="/me")
+
+    @property
+    def quota(self) -> int | None:
+        """Searches left this month as last seen by `/me`, minus the ones made since."""
+        return self._quota
+
+    async def reserve_quota(self) -> bool:
+        async with self._quota_lock:
+            if time.monotonic() - self._quota_checked >= config.trace_moe_quota_refresh:
+                self._quota_checked = time.monotonic()
+                try:
+                    status, data = await self.me()
+                except ClientError as error:
+                    log.warning("Couldn't fetch trace.moe quota.", error=repr(error))
+                else:
+                    if status == 200:
+                        self._quota = data["quota"] - data["quotaUsed"]
+
+            # Don't block searches just because /me is unavailable
+            if self._quota is None:
+                return True
+            if self._quota <= 0:
+                return False
+
+            self._quota -= 1
+            return True
+
+    def refund_quota(self) -> None:
+        # trace.moe only counts searches that succeeded
+        if self._quota is not None:
+            self._quota += 1
+
+    @cache(ttl="1h", key="trace_moe_search:{digest}", condition=is_success)
+    async def search(
+        self, file: bytes | memoryview | BinaryIO, digest: str
+    ) -> tuple[int, dict[str, Any]]:
+        if not await self.reserve_quota():
+            # The status trace.moe itself answers with once the quota is depleted
+            return 402, {"error": "Search quota depleted"}
 
-    @cache(ttl="1h")
-    async def search(self, file: bytes | BinaryIO) -> tuple[int, dict[str, Any]]:
-        return await self._make_request(
-            method="POST",
-            url="/search?anilistInfo&cutBorders",
-            data={"image": file},
-        )
+        status = None
+        try:
+            async with self._semaphore:
+                status, data = await self._make_request(
+                    method="POST",
+                    url="/search?anilistInfo&cutBorders",
+                    data={"image": file},
+                )
+        finally:
+            if status != 200:
+                self.refund_quota()
+        return status, data
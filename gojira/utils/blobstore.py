@@ -0,0 +1,169 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import fcntl
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager, contextmanager, suppress
+from pathlib import Path
+from typing import BinaryIO
+
+from gojira import app_dir
+from gojira.config import config
+from gojira.utils.logging import log
+
+# Temporary files of a write that never finished, kept this long in case it still is
+TMP_MAX_AGE: int = 3600
+
+
+class BlobStore:
+    """Content-addressed files on local disk, keyed by SHA-256 and evicted in LRU order.
+
+    The disk is the only index, so every process sharing the directory (e.g. prefork
+    workers) enforces one common cap: the size is recomputed under a file lock before
+    evicting, and blobs held open by any process are skipped.
+    """
+
+    def __init__(self, root: Path, max_size: int) -> None:
+        self.root = root
+        self.max_size = max_size
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Size of the store as of the last eviction pass."""
+        return self._size
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / ".lock").open("ab") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @staticmethod
+    def _unlink_unused(path: Path) -> bool:
+        try:
+            with path.open("rb") as file:
+                # Readers hold a shared lock for as long as they use the blob
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                path.unlink()
+        except BlockingIOError:
+            return False
+        except FileNotFoundError:
+            return True
+        return True
+
+    def _evict(self) -> None:
+        blobs: list[tuple[float, Path, int]] = []
+        for path in self.root.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == ".tmp":
+                # Another process may still be writing it, only drop abandoned ones
+                if time.time() - stat.st_mtime > TMP_MAX_AGE:
+                    path.unlink(missing_ok=True)
+                continue
+            blobs.append((stat.st_mtime, path, stat.st_size))
+
+        size = sum(blob_size for _mtime, _blob, blob_size in blobs)
+        for _mtime, path, blob_size in sorted(blobs):
+            if size <= self.max_size:
+                break
+            if self._unlink_unused(path):
+                size -= blob_size
+                log.debug("Evicted blob.", digest=path.name, size=blob_size)
+        self._size = size
+
+    def _put(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        # Already stored, only move it up in the LRU order, which is kept by the mtime
+        with suppress(FileNotFoundError):
+            os.utime(path)
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            Path(tmp_path).replace(path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._exclusive():
+            self._evict()
+
+    def _acquire(self, digest: str) -> BinaryIO | None:
+        path = self._path(digest)
+        try:
+            file = path.open("rb")
+        except FileNotFoundError:
+            return None
+
+        fcntl.flock(file, fcntl.LOCK_SH)
+        # Evicted between opening and locking it
+        if os.fstat(file.fileno()).st_nlink == 0:
+            file.close()
+            return None
+
+        os.utime(path)
+        return file
+
+    async def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._put, digest, data)
+        return digest
+
+    async def exists(self, digest: str) -> bool:
+        return await asyncio.to_thread(self._path(digest).exists)
+
+    @asynccontextmanager
+    async def path(self, digest: str) -> AsyncGenerator[Path | None, None]:
+        # For tools that need a real file, e.g. ffmpeg, it's kept until the block exits
+        file = await asyncio.to_thread(self._acquire, digest)
+        if file is None:
+            yield None
+            return
+
+        try:
+            yield self._path(digest)
+        finally:
+            file.close()
+
+    @asynccontextmanager
+    async def open(self, digest: str) -> AsyncGenerator[memoryview | None, None]:
+        file = await asyncio.to_thread(self._acquire, digest)
+        if file is None:
+            yield None
+            return
+
+        with file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                yield None
+                return
+
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                mapped.close()
+
+
+blob_store = BlobStore(app_dir / config.blob_store_dir, config.blob_store_size)
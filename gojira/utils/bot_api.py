@@ -0,0 +1,32 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from pathlib import Path
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import (
+    BareFilesPathWrapper,
+    FilesPathWrapper,
+    SimpleFilesPathWrapper,
+    TelegramAPIServer,
+)
+
+from gojira.config import config
+
+
+def create_session() -> AiohttpSession | None:
+    """Session for a self-hosted Bot API server, None for the public one."""
+    if not config.bot_api_url:
+        return None
+
+    # In local mode the server returns paths inside its --dir, which may be mounted elsewhere
+    files_path: FilesPathWrapper = BareFilesPathWrapper()
+    if config.bot_api_server_dir and config.bot_api_local_dir:
+        files_path = SimpleFilesPathWrapper(
+            Path(config.bot_api_server_dir), Path(config.bot_api_local_dir)
+        )
+
+    api = TelegramAPIServer.from_base(
+        str(config.bot_api_url), is_local=config.bot_api_local, wrap_local_file=files_path
+    )
+    return AiohttpSession(api=api)
@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import time
+from typing import Any
+
+from cashews import Cache
+from cashews.backends.interface import Backend
+from cashews.backends.memory import Memory
+from cashews.commands import Command
+from cashews.exceptions import CacheBackendInteractionError
+from redis.exceptions import RedisError
+
+from gojira.config import config
+from gojira.utils.deadline import bounded
+from gojira.utils.logging import log
+
+
+class RedisFallback:
+    """Cashews middleware that serves commands from a local backend while Redis is down."""
+
+    def __init__(self, fallback: Backend, retry_after: float) -> None:
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self._retry_at: float = 0
+
+    @property
+    def degraded(self) -> bool:
+        return time.monotonic() < self._retry_at
+
+    async def __call__(
+        self, call: Any, cmd: Command, backend: Backend, *args: Any, **kwargs: Any
+    ) -> Any:
+        if not self.degraded:
+            try:
+                return await call(*args, **kwargs)
+            except (CacheBackendInteractionError, RedisError, OSError) as error:
+                log.warning("Redis is unavailable, using the local cache.", error=repr(error))
+                self._retry_at = time.monotonic() + self.retry_after
+
+        if not self.fallback.is_init:
+            await self.fallback.init()
+        return await getattr(self.fallback, cmd.value)(*args, **kwargs)
+
+
+async def bound_to_deadline(
+    call: Any, cmd: Command, backend: Backend, *args: Any, **kwargs: Any
+) -> Any:
+    # A slow Redis must not hold an update past its deadline
+    async with bounded():
+        return await call(*args, **kwargs)
+
+
+def setup_cache(cache: Cache) -> None:
+    if config.cache_backend == "memory":
+        cache.setup(f"mem://?size={config.cache_memory_size}")
+    elif config.cache_backend == "disk":
+        cache.setup(
+            f"disk://?directory={config.cache_disk_dir}&size_limit={config.cache_disk_size}"
+        )
+    else:
+        fallback = Memory(size=config.cache_memory_size)
+        cache.setup(
+            f"redis://{config.redis_host}",
+            middlewares=(
+                bound_to_deadline,
+                RedisFallback(fallback, retry_after=config.cache_redis_retry),
+            ),
+            client_side=True,
+            suppress=False,
+        )
@@ -1,10 +1,15 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
+import asyncio
+import hashlib
 from contextlib import suppress
+from pathlib import Path
 
+import orjson
 from aiogram import Bot
 from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SetMyCommands
 from aiogram.types import (
     BotCommand,
     BotCommandScopeAllGroupChats,
@@ -12,79 +17,105 @@ from aiogram.types import (
 )
 from aiogram.utils.i18n import I18n
 
+from gojira import app_dir
+from gojira.utils.logging import log
 
-async def set_ui_commands(bot: Bot, i18n: I18n):
+# Hash of the last uploaded menus, they are only uploaded again when it changes
+COMMANDS_HASH_PATH: Path = app_dir / "data/commands.sha256"
+
+
+def build_ui_commands(i18n: I18n) -> list[SetMyCommands]:
     _ = i18n.gettext
 
-    with suppress(TelegramRetryAfter):
-        await bot.delete_my_commands()
-        for lang in (*i18n.available_locales, i18n.default_locale):
-            all_chats_commands: list[BotCommand] = [
-                BotCommand(
-                    command="anime",
-                    description=_("Get anime informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="manga",
-                    description=_("Get manga informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="character",
-                    description=_("Get character informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="staff",
-                    description=_("Get staff informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="studio",
-                    description=_("Get studio informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="scan",
-                    description=_("Try to identify the source anime of a media", locale=lang),
-                ),
-                BotCommand(
-                    command="user",
-                    description=_("Get AniList user informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="airing",
-                    description=_("Get anime airing informations.", locale=lang),
-                ),
-                BotCommand(
-                    command="schedule",
-                    description=_("Get anime schedules.", locale=lang),
-                ),
-                BotCommand(
-                    command="language",
-                    description=_("Change bot language.", locale=lang),
-                ),
-                BotCommand(
-                    command="about",
-                    description=_("About the bot.", locale=lang),
-                ),
-            ]
+    methods: list[SetMyCommands] = []
+    for lang in (*i18n.available_locales, i18n.default_locale):
+        all_chats_commands: list[BotCommand] = [
+            BotCommand(
+                command="anime",
+                description=_("Get anime informations.", locale=lang),
+            ),
+            BotCommand(
+                command="manga",
+                description=_("Get manga informations.", locale=lang),
+            ),
+            BotCommand(
+                command="character",
+                description=_("Get character informations.", locale=lang),
+            ),
+            BotCommand(
+                command="staff",
+                description=_("Get staff informations.", locale=lang),
+            ),
+            BotCommand(
+                command="studio",
+                description=_("Get studio informations.", locale=lang),
+            ),
+            BotCommand(
+                command="scan",
+                description=_("Try to identify the source anime of a media", locale=lang),
+            ),
+            BotCommand(
+                command="user",
+                description=_("Get AniList user informations.", locale=lang),
+            ),
+            BotCommand(
+                command="airing",
+                description=_("Get anime airing informations.", locale=lang),
+            ),
+            BotCommand(
+                command="schedule",
+                description=_("Get anime schedules.", locale=lang),
+            ),
+            BotCommand(
+                command="language",
+                description=_("Change bot language.", locale=lang),
+            ),
+            BotCommand(
+                command="about",
+                description=_("About the bot.", locale=lang),
+            ),
+        ]
 
-            user_commands: list[BotCommand] = [
-                BotCommand(command="start", description=_("Start the bot.", locale=lang)),
-                BotCommand(command="help", description=_("Get help.", locale=lang)),
-                *all_chats_commands,
-            ]
+        user_commands: list[BotCommand] = [
+            BotCommand(command="start", description=_("Start the bot.", locale=lang)),
+            BotCommand(command="help", description=_("Get help.", locale=lang)),
+            *all_chats_commands,
+        ]
 
-            group_commands: list[BotCommand] = [
-                BotCommand(command="upcoming", description=_("Get upcoming media.", locale=lang)),
-                *all_chats_commands,
-            ]
+        group_commands: list[BotCommand] = [
+            BotCommand(command="upcoming", description=_("Get upcoming media.", locale=lang)),
+            *all_chats_commands,
+        ]
 
-            await bot.set_my_commands(
+        language_code = lang.split("_")[0].lower() if "_" in lang else lang
+        methods.extend((
+            SetMyCommands(
                 commands=user_commands,
                 scope=BotCommandScopeAllPrivateChats(),
-                language_code=lang.split("_")[0].lower() if "_" in lang else lang,
-            )
-
-            await bot.set_my_commands(
+                language_code=language_code,
+            ),
+            SetMyCommands(
                 commands=group_commands,
                 scope=BotCommandScopeAllGroupChats(),
-                language_code=lang.split("_")[0].lower() if "_" in lang else lang,
-            )
+                language_code=language_code,
+            ),
+        ))
+
+    return methods
+
+
+async def set_ui_commands(bot: Bot, i18n: I18n):
+    methods = build_ui_commands(i18n)
+    menus = [bot.id, *(method.model_dump(mode="json") for method in methods)]
+    digest = hashlib.sha256(orjson.dumps(menus, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    with suppress(FileNotFoundError):
+        if await asyncio.to_thread(COMMANDS_HASH_PATH.read_text, encoding="utf-8") == digest:
+            log.info("Command menus are up to date.")
+            return
+
+    with suppress(TelegramRetryAfter):
+        await bot.delete_my_commands()
+        await asyncio.gather(*(bot(method) for method in methods))
+        await asyncio.to_thread(COMMANDS_HASH_PATH.write_text, digest, encoding="utf-8")
+        log.info("Uploaded command menus.", menus=len(methods))
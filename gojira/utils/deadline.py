@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+# Loop time at which the update being handled must be done, None outside of updates
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    pass
+
+
+def remaining() -> float | None:
+    if (at := _deadline.get()) is None:
+        return None
+    return at - asyncio.get_running_loop().time()
+
+
+@contextmanager
+def deadline(seconds: float) -> Generator[None, None, None]:
+    """Set the deadline of the current context, never later than an outer one."""
+    at = asyncio.get_running_loop().time() + seconds
+    if (current := _deadline.get()) is not None:
+        at = min(at, current)
+
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@asynccontextmanager
+async def bounded() -> AsyncGenerator[None, None]:
+    """Cancel the block once the deadline passes, raising DeadlineExceededError."""
+    if (at := _deadline.get()) is None:
+        yield
+        return
+
+    if at <= asyncio.get_running_loop().time():
+        raise DeadlineExceededError
+
+    timeout = asyncio.timeout_at(at)
+    try:
+        async with timeout:
+            yield
+    except TimeoutError as error:
+        if timeout.expired():
+            raise DeadlineExceededError from error
+        raise
@@ -114,6 +114,142 @@ query($search: String, $page: Int = 1, $per_page: Int = 10) {
 """
 
 
+ANIME_INLINE_SEARCH: str = """
+query($search: String, $page: Int = 1, $per_page: Int = 10) {
+    Page(page: $page, perPage: $per_page) {
+        pageInfo {
+            hasNextPage
+        }
+        media(search: $search, type: ANIME, sort: POPULARITY_DESC) {
+            id
+            title {
+                romaji
+                native
+            }
+            episodes
+            description
+            format
+            status
+            duration
+            genres
+            studios {
+                nodes {
+                    name
+                    isAnimationStudio
+                }
+            }
+            startDate {
+                year
+                month
+                day
+            }
+            endDate {
+                year
+                month
+                day
+            }
+            season
+            seasonYear
+            source
+            averageScore
+            bannerImage
+            coverImage {
+                medium
+                large
+                extraLarge
+            }
+        }
+    }
+}
+"""
+
+MANGA_INLINE_SEARCH: str = """
+query($search: String, $page: Int = 1, $per_page: Int = 10) {
+    Page(page: $page, perPage: $per_page) {
+        pageInfo {
+            hasNextPage
+        }
+        media(search: $search, type: MANGA, sort: POPULARITY_DESC) {
+            id
+            title {
+                romaji
+                native
+            }
+            chapters
+            volumes
+            description
+            format
+            status
+            genres
+            startDate {
+                year
+                month
+                day
+            }
+            endDate {
+                year
+                month
+                day
+            }
+            source
+            averageScore
+            bannerImage
+            coverImage {
+                medium
+                large
+                extraLarge
+            }
+        }
+    }
+}
+"""
+
+CHARACTER_INLINE_SEARCH: str = """
+query($search: String, $page: Int = 1, $per_page: Int = 10) {
+    Page(page: $page, perPage: $per_page) {
+        pageInfo {
+            hasNextPage
+        }
+        characters(search: $search) {
+            id
+            name {
+                full
+            }
+            image {
+                large
+                medium
+            }
+            description
+            favourites
+        }
+    }
+}
+"""
+
+STAFF_INLINE_SEARCH: str = """
+query($search: String, $page: Int = 1, $per_page: Int = 10) {
+    Page(page: $page, perPage: $per_page) {
+        pageInfo {
+            hasNextPage
+        }
+        staff(search: $search) {
+            id
+            name {
+                full
+            }
+            image {
+                large
+                medium
+            }
+            description
+            favourites
+            language
+        }
+    }
+}
+"""
+
+
 ANIME_GET: str = """
 query($id: Int, $idMal: Int) {
     Page(page: 1, perPage: 1) {
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from gojira.config import config
+
+BORDER_THRESHOLD: int = 16
+
+
+def dhash(image: Image.Image, size: int = 8) -> int:
+    """Difference hash of an image, close images differ in few bits."""
+    gray = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = gray.tobytes()
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def crop_borders(image: Image.Image) -> Image.Image:
+    # Letterboxing and screenshot frames are near-black or near-white
+    for invert in (False, True):
+        gray = image.convert("L")
+        if invert:
+            gray = ImageOps.invert(gray)
+
+        bbox = gray.point(lambda p: 255 if p > BORDER_THRESHOLD else 0).getbbox()
+        if not bbox:
+            continue
+
+        left, top, right, bottom = bbox
+        # Don't crop dark or bright scenes down to a sliver
+        if (right - left) * (bottom - top) >= image.width * image.height // 4:
+            image = image.crop(bbox)
+    return image
+
+
+def preprocess(data: bytes, max_size: int, quality: int) -> tuple[bytes, int] | None:
+    """Decode the first frame, crop borders, downscale and re-encode as JPEG.
+
+    Returns the JPEG and its dHash, or `None` if the image can't be decoded.
+    Runs in a worker process, so it only gets picklable arguments.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            # Stickers and GIFs keep their first frame only
+            source.seek(0)
+            image = ImageOps.exif_transpose(source).convert("RGB")
+    except (UnidentifiedImageError, OSError, EOFError):
+        return None
+
+    image = crop_borders(image)
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=quality, optimize=True)
+    return output.getvalue(), dhash(image)
+
+
+class ImageProcessor:
+    """Run image preprocessing in a process pool, off the event loop."""
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def prepare(self, data: bytes | memoryview) -> tuple[bytes, int] | None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(),
+            preprocess,
+            bytes(data),
+            config.scan_image_size,
+            config.scan_image_quality,
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+image_processor = ImageProcessor(max_workers=config.scan_workers)
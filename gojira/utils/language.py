@@ -1,53 +1,68 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
-from aiogram.enums import ChatType
-from aiogram.types import CallbackQuery, InaccessibleMessage, Message
+from collections.abc import Callable, Mapping
+from functools import cache
+from types import MappingProxyType
+
+from aiogram.types import User
+from aiogram.utils.i18n import I18n, get_i18n
 from aiogram.utils.i18n import gettext as _
+from babel import Locale
 
-from gojira.database import Chats, Users
+from gojira.database import language_cache
 
 
-async def get_chat_language(
-    union: Message | CallbackQuery,
-) -> tuple[str | None, list | str | None]:
-    is_callback = isinstance(union, CallbackQuery)
-    message = union.message if is_callback else union
-    if not message or not union.from_user:
-        return None, None
+class TranslationTable[K, V]:
+    """A mapping of translated strings, built once per locale on first use.
 
-    if isinstance(message, InaccessibleMessage):
-        return None, None
+    The builder runs with the locale already active, so ``_()`` calls in it
+    translate as usual and are still found by ``pybabel extract``.
+    """
 
-    if not message or not message.from_user:
-        return message.chat.type, None
+    def __init__(self, build: Callable[[], dict[K, V]]) -> None:
+        self.build = build
+        self._tables: dict[str, Mapping[K, V]] = {}
 
-    language_code = None
+    def current(self) -> Mapping[K, V]:
+        locale = get_i18n().current_locale
+        if (table := self._tables.get(locale)) is None:
+            table = self._tables[locale] = MappingProxyType(self.build())
+        return table
 
-    if message.chat.type == ChatType.PRIVATE:
-        user = union.from_user
-        language_code = await Users.get_language(user=user)
 
-    if message.chat.type in {ChatType.GROUP, ChatType.SUPERGROUP}:
-        chat = message.chat
-        language_code = await Chats.get_language(chat=chat)
+def get_cached_locale(i18n: I18n, user: User) -> str:
+    # Only what's already cached, for replies that must not touch the database
+    entry = language_cache.get("users", user.id)
+    if entry and entry.language_code in i18n.available_locales:
+        return entry.language_code
+    return i18n.default_locale
 
-    return message.chat.type, language_code
 
+@cache
+def locale_display_name(locale: str) -> str:
+    # Names are written in their own language, the same for every user
+    return str(Locale.parse(locale).display_name).capitalize()
 
-def i18n_anilist_status(status: str) -> str:
-    status_dict = {
+
+@TranslationTable
+def anilist_status() -> dict[str, str]:
+    return {
         "FINISHED": _("Finished"),
         "RELEASING": _("Releasing"),
         "NOT_YET_RELEASED": _("Not yet released"),
         "CANCELLED": _("Cancelled"),
         "HIATUS": _("Hiatus"),
     }
-    return status_dict.get(status, "")
 
 
-def i18n_anilist_source(source: str) -> str:
-    source_dict = {
+def i18n_anilist_status(status: str) -> str:
+    return anilist_status.current().get(status, "")
+
+
+@TranslationTable
+def anilist_source() -> dict[str, str]:
+    return {
         "ORIGINAL": _("Original"),
         "MANGA": _("Manga"),
         "LIGHT_NOVEL": _("Light Novel"),
@@ -64,11 +79,15 @@ def i18n_anilist_source(source: str) -> str:
         "MULTIMEDIA_PROJECT": _("Multimedia Project"),
         "PICTURE_BOOK": _("Picture Book"),
     }
-    return source_dict.get(source, "")
 
 
-def i18n_anilist_format(anilist_format: str) -> str:
-    format_dict = {
+def i18n_anilist_source(source: str) -> str:
+    return anilist_source.current().get(source, "")
+
+
+@TranslationTable
+def anilist_format() -> dict[str, str]:
+    return {
         "TV": _("TV"),
         "TV_SHORT": _("TV Short"),
         "MOVIE": _("Movie"),
@@ -80,14 +99,58 @@ def i18n_anilist_format(anilist_format: str) -> str:
         "NOVEL": _("Novel"),
         "ONE_SHOT": _("One Shot"),
     }
-    return format_dict.get(anilist_format, "")
 
 
-def i18n_anilist_season(season: str) -> str:
-    season_dict = {
+def i18n_anilist_format(media_format: str) -> str:
+    return anilist_format.current().get(media_format, "")
+
+
+@TranslationTable
+def anilist_season() -> dict[str, str]:
+    return {
         "WINTER": _("Winter"),
         "SPRING": _("Spring"),
         "SUMMER": _("Summer"),
         "FALL": _("Fall"),
     }
-    return season_dict.get(season, "")
+
+
+def i18n_anilist_season(season: str) -> str:
+    return anilist_season.current().get(season, "")
+
+
+@TranslationTable
+def anilist_genres() -> dict[str, str]:
+    return {
+        "Action": _("Action"),
+        "Adventure": _("Adventure"),
+        "Comedy": _("Comedy"),
+        "Drama": _("Drama"),
+        "Ecchi": _("Ecchi"),
+        "Fantasy": _("Fantasy"),
+        "Horror": _("Horror"),
+        "Mahou Shoujo": _("Mahou Shoujo"),
+        "Mecha": _("Mecha"),
+        "Music": _("Music"),
+        "Mystery": _("Mystery"),
+        "Psychological": _("Psychological"),
+        "Romance": _("Romance"),
+        "Sci-Fi": _("Sci-Fi"),
+        "Slice of Life": _("Slice of Life"),
+        "Sports": _("Sports"),
+        "Supernatural": _("Supernatural"),
+        "Thriller": _("Thriller"),
+    }
+
+
+@TranslationTable
+def weekdays() -> dict[int, str]:
+    return {
+        0: _("Monday"),
+        1: _("Tuesday"),
+        2: _("Wednesday"),
+        3: _("Thursday"),
+        4: _("Friday"),
+        5: _("Saturday"),
+        6: _("Sunday"),
+    }
@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, SendChatAction, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from gojira.config import config
+from gojira.utils.deadline import remaining
+from gojira.utils.logging import log
+
+# Lower sends first
+INTERACTIVE: int = 0
+BACKGROUND: int = 1
+
+# Methods that post or change a message count towards the flood limits
+MESSAGE_METHOD_PREFIXES: tuple[str, ...] = ("send", "edit", "copy", "forward")
+# Only new messages count towards a group's per-minute limit, edits just the global one
+GROUP_METHOD_PREFIXES: tuple[str, ...] = ("send", "copy", "forward")
+
+# Sends allowed back to back before pacing kicks in, e.g. a reply and its first edits
+BURST: int = 3
+
+# Set for replies about an update sent outside of its deadline, e.g. failure notices
+_interactive: ContextVar[bool] = ContextVar("interactive", default=False)
+
+
+@contextmanager
+def interactive() -> Generator[None, None, None]:
+    """Send at interactive priority, even outside of an update's deadline."""
+    token = _interactive.set(True)
+    try:
+        yield
+    finally:
+        _interactive.reset(token)
+
+
+class TokenBucket:
+    """Token bucket whose waiters are served by priority, then in arrival order."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until: float = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def waiting(self) -> int:
+        return sum(not future.done() for _priority, _order, future in self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        self._refill()
+        return not self._waiters and self._tokens >= self.capacity
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now > self._paused_until:
+            elapsed = now - max(self._updated, self._paused_until)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _release(self) -> None:
+        self._timer = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _priority, _order, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        # Drop waiters that gave up, then come back once the next token is in
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if self._waiters:
+            delay = max(self._paused_until - time.monotonic(), 0) + (1 - self._tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def pause(self, seconds: float) -> None:
+        # Telegram said to stop, nothing is sent here until then
+        self._refill()
+        self._tokens = 0
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        if self._timer:
+            self._timer.cancel()
+        self._release()
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+        if not self._timer:
+            self._release()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was already handed over, give it to the next one
+                self._tokens += 1
+                self._release()
+            raise
+
+
+class SendScheduler(BaseRequestMiddleware):
+    """Pace outgoing messages below Telegram's flood limits.
+
+    A global bucket covers every message and one bucket per group covers the
+    new messages in that group. Replies sent while handling an update go before
+    background sends, and sends refused with ``retry_after`` wait that long and
+    are retried.
+    """
+
+    def __init__(
+        self, global_rate: float, group_rate: float, max_retries: int, max_groups: int = 10_000
+    ) -> None:
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self.max_groups = max_groups
+        self._global = self.bucket(global_rate, window=1)
+        self._groups: dict[int | str, TokenBucket] = {}
+        self.retried = 0
+
+    @property
+    def metrics(self) -> dict[str, int]:
+        waiting = self._global.waiting + sum(bucket.waiting for bucket in self._groups.values())
+        return {"waiting": waiting, "groups": len(self._groups), "retried": self.retried}
+
+    @staticmethod
+    def bucket(limit: float, window: float) -> TokenBucket:
+        # A full bucket plus what refills within the window must stay within the limit,
+        # so the burst is taken out of the refill rate
+        capacity = max(1, min(BURST, int(limit) // 2))
+        return TokenBucket(max(limit - capacity, limit / 2) / window, capacity=capacity)
+
+    @staticmethod
+    def is_message(method: TelegramMethod) -> bool:
+        if isinstance(method, SendChatAction):
+            return False
+        return method.__api_method__.startswith(MESSAGE_METHOD_PREFIXES)
+
+    def _group_bucket(self, method: TelegramMethod) -> TokenBucket | None:
+        if not method.__api_method__.startswith(GROUP_METHOD_PREFIXES):
+            return None
+
+        chat_id = getattr(method, "chat_id", None)
+        # Private chats have positive ids, groups and channels negative ids or usernames
+        if chat_id is None or (isinstance(chat_id, int) and chat_id > 0):
+            return None
+
+        if (bucket := self._groups.get(chat_id)) is None:
+            if len(self._groups) >= self.max_groups:
+                self._groups = {
+                    key: value for key, value in self._groups.items() if not value.idle
+                }
+            bucket = self._groups[chat_id] = self.bucket(self.group_rate, window=60)
+        return bucket
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if not self.is_message(method):
+            return await make_request(bot, method)
+
+        # Someone waits for replies to updates, they have a deadline
+        priority = INTERACTIVE if remaining() is not None or _interactive.get() else BACKGROUND
+        group = self._group_bucket(method)
+
+        attempt = 0
+        while True:
+            if group:
+                await group.acquire(priority)
+            await self._global.acquire(priority)
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as error:
+                if attempt >= self.max_retries:
+                    raise
+
+                attempt += 1
+                self.retried += 1
+                log.warning(
+                    "Flood control hit, retrying.",
+                    method=method.__api_method__,
+                    retry_after=error.retry_after,
+                )
+                if group:
+                    group.pause(error.retry_after)
+                else:
+                    # Private chats have no bucket of their own, only this send waits
+                    await asyncio.sleep(error.retry_after)
+
+
+send_scheduler = SendScheduler(
+    # prefork workers share Telegram's global limit
+    global_rate=config.send_global_rate / config.workers,
+    group_rate=config.send_group_rate,
+    max_retries=config.send_max_retries,
+)
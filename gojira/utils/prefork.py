@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from collections.abc import Awaitable, Callable
+from multiprocessing.context import SpawnContext
+from multiprocessing.queues import Queue
+from queue import Full
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.methods import TelegramMethod
+from aiogram.types import TelegramObject, Update
+
+from gojira.utils.logging import log
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+# Sent to the receiver to ask for a full restart
+RESTART_SIGNAL = signal.SIGUSR1
+
+
+def receiver_pid() -> int:
+    parent = multiprocessing.parent_process()
+    return parent.pid if parent is not None and parent.pid is not None else os.getpid()
+
+
+def restart() -> None:
+    # The receiver restarts everything once it has torn down, even in a single process,
+    # so pending writes are flushed and connections closed before exec
+    os.kill(receiver_pid(), RESTART_SIGNAL)
+
+
+class WorkerMetrics:
+    """Counters published by every worker, summed up for the receiver's health check.
+
+    Workers publish once they are set up, so the receiver also learns when they're ready.
+    """
+
+    def __init__(self, context: SpawnContext, workers: int, names: tuple[str, ...]) -> None:
+        self.names = names
+        self._values = context.Array("q", workers * len(names), lock=False)
+        self._published = context.Array("b", workers, lock=False)
+
+    @property
+    def published(self) -> bool:
+        return all(self._published)
+
+    def publish(self, worker: int, metrics: dict[str, int]) -> None:
+        offset = worker * len(self.names)
+        for index, name in enumerate(self.names):
+            self._values[offset + index] = metrics.get(name, 0)
+        self._published[worker] = 1
+
+    def total(self) -> dict[str, int]:
+        return {
+            name: sum(self._values[index :: len(self.names)])
+            for index, name in enumerate(self.names)
+        }
+
+
+class WorkerPool(BaseMiddleware):
+    """Receiver-side middleware that hands updates to worker processes instead of handling them.
+
+    Updates are routed by chat id (or user id) hash, so every chat is served by a
+    single worker and its updates are delivered there in order. Handling them in
+    order is left to the worker's dispatcher, see ``DispatchController``.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[Queue, WorkerMetrics, int], None],
+        workers: int,
+        queue_size: int,
+        stop_timeout: float,
+        metrics: tuple[str, ...],
+    ) -> None:
+        self.target = target
+        self.stop_timeout = stop_timeout
+        # Workers start their own process pools, which fork() doesn't mix well with
+        self._context = multiprocessing.get_context("spawn")
+        self._queues: list[Queue] = [
+            self._context.Queue(maxsize=queue_size) for _ in range(workers)
+        ]
+        self._processes: list[BaseProcess] = []
+        self.metrics = WorkerMetrics(self._context, workers, metrics)
+
+    def start(self) -> None:
+        for index, queue in enumerate(self._queues):
+            process = self._context.Process(
+                target=self.target,
+                args=(queue, self.metrics, index),
+                name=f"gojira-worker-{index}",
+            )
+            process.start()
+            self._processes.append(process)
+        log.info("Started worker processes.", workers=len(self._processes))
+
+    async def wait_ready(self) -> None:
+        while not self.metrics.published:
+            if not all(process.is_alive() for process in self._processes):
+                log.warning("A worker exited before getting ready.")
+                return
+            await asyncio.sleep(0.1)
+
+    async def stop(self) -> None:
+        for queue in self._queues:
+            await asyncio.to_thread(queue.put, None)
+
+        for process in self._processes:
+            await asyncio.to_thread(process.join, self.stop_timeout)
+            if process.is_alive():
+                log.warning("Worker didn't stop in time, terminating it.", worker=process.name)
+                process.terminate()
+                await asyncio.to_thread(process.join)
+        self._processes.clear()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        key = chat.id if chat else user.id if user else event.update_id
+        queue = self._queues[key % len(self._queues)]
+
+        update = event.model_dump(mode="json", exclude_none=True)
+        try:
+            queue.put_nowait(update)
+        except Full:
+            # Slow down the receiver instead of dropping updates
+            await asyncio.to_thread(queue.put, update)
+        return None
+
+
+async def consume_updates(dispatcher: Dispatcher, bot: Bot, updates: Queue) -> None:
+    """Feed updates from the receiver to the dispatcher until it sends `None`.
+
+    Every update gets its own task, the per-chat order is kept by the dispatcher's
+    middlewares as in the single-process mode.
+    """
+    tasks: set[asyncio.Task] = set()
+
+    async def process(update: dict[str, Any]) -> None:
+        result = await dispatcher.feed_raw_update(bot, update)
+        if isinstance(result, TelegramMethod):
+            await dispatcher.silent_call_request(bot, result)
+
+    while (update := await asyncio.to_thread(updates.get)) is not None:
+        task = asyncio.create_task(process(update))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.wait(tasks)
@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+from typing import Any
+
+from gojira import cache
+from gojira.config import config
+
+HASH_BITS: int = 64
+BUCKET_SIZE: int = 32
+
+
+def _bands(image_hash: int) -> list[tuple[int, int]]:
+    # Two hashes within the threshold distance always share at least one
+    # of threshold + 1 bands exactly (pigeonhole), so only those are compared
+    count = config.scan_dhash_threshold + 1
+    width = HASH_BITS // count
+    bands = []
+    for index in range(count):
+        bits = width if index < count - 1 else HASH_BITS - width * index
+        bands.append((index, (image_hash >> (width * index)) & ((1 << bits) - 1)))
+    return bands
+
+
+async def get_by_unique_id(file_unique_id: str) -> dict[str, Any] | None:
+    return await cache.get(f"scan_result:{file_unique_id}")
+
+
+async def get_by_hash(image_hash: int) -> dict[str, Any] | None:
+    candidates: set[int] = set()
+    for index, band in _bands(image_hash):
+        candidates.update(await cache.get(f"scan_dhash:{index}:{band:x}") or ())
+
+    for candidate in sorted(candidates, key=lambda c: (c ^ image_hash).bit_count()):
+        if (candidate ^ image_hash).bit_count() > config.scan_dhash_threshold:
+            break
+        if data := await cache.get(f"scan_result:dhash:{candidate:016x}"):
+            return data
+    return None
+
+
+async def store(file_unique_id: str | None, image_hash: int | None, data: dict[str, Any]) -> None:
+    if file_unique_id is not None:
+        await cache.set(f"scan_result:{file_unique_id}", data, expire="7d")
+    if image_hash is None:
+        return
+
+    await cache.set(f"scan_result:dhash:{image_hash:016x}", data, expire="7d")
+    for index, band in _bands(image_hash):
+        key = f"scan_dhash:{index}:{band:x}"
+        bucket: list[int] = await cache.get(key) or []
+        if image_hash not in bucket:
+            bucket = [*bucket, image_hash][-BUCKET_SIZE:]
+            await cache.set(key, bucket, expire="7d")
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import math
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from gojira.config import config
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class ScanJob:
+    chat_id: int
+    user_id: int
+    started: bool = field(default=False, init=False)
+
+
+class ScanQueue:
+    """Run scans with bounded global and per-user concurrency, round-robin across chats."""
+
+    def __init__(self, concurrency: int, user_concurrency: int, position_interval: float) -> None:
+        self.concurrency = concurrency
+        self.user_concurrency = user_concurrency
+        self.position_interval = position_interval
+        self._chats: OrderedDict[int, deque[ScanJob]] = OrderedDict()
+        self._running: dict[int, int] = {}
+        self._active = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def size(self) -> int:
+        return sum(len(jobs) for jobs in self._chats.values())
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, later waiters get a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _next_job(self) -> ScanJob | None:
+        for chat_id, jobs in self._chats.items():
+            for job in jobs:
+                if self._running.get(job.user_id, 0) < self.user_concurrency:
+                    break
+            else:
+                continue
+
+            jobs.remove(job)
+            if jobs:
+                # The chat goes to the back of the line after each served job
+                self._chats.move_to_end(chat_id)
+            else:
+                del self._chats[chat_id]
+            return job
+        return None
+
+    def _dispatch(self) -> None:
+        while self._active < self.concurrency and (job := self._next_job()):
+            job.started = True
+            self._active += 1
+            self._running[job.user_id] = self._running.get(job.user_id, 0) + 1
+        self._notify()
+
+    def position(self, job: ScanJob) -> int:
+        """Estimated place of a waiting job in line, ignoring per-user limits."""
+        own = self._chats[job.chat_id]
+        index = own.index(job)
+        ahead = index
+        before = True
+        for chat_id, jobs in self._chats.items():
+            if chat_id == job.chat_id:
+                before = False
+                continue
+            # Round-robin serves every chat once per turn, chats in front of ours one extra time
+            ahead += min(len(jobs), index + before)
+        return ahead + 1
+
+    def _finish(self, job: ScanJob) -> None:
+        if job.started:
+            self._active -= 1
+            if (running := self._running[job.user_id] - 1) > 0:
+                self._running[job.user_id] = running
+            else:
+                del self._running[job.user_id]
+        else:
+            jobs = self._chats[job.chat_id]
+            jobs.remove(job)
+            if not jobs:
+                del self._chats[job.chat_id]
+        self._dispatch()
+
+    async def run(
+        self,
+        chat_id: int,
+        user_id: int,
+        func: Callable[[], Awaitable[T]],
+        on_position: Callable[[int], Awaitable[object]] | None = None,
+    ) -> T:
+        """Wait for a free slot and run `func`.
+
+        `on_position` is awaited with the place in line when it changes, at
+        most once per `position_interval`, and with 0 when a job that had to
+        wait starts.
+        """
+        job = ScanJob(chat_id, user_id)
+        self._chats.setdefault(chat_id, deque()).append(job)
+        self._dispatch()
+
+        loop = asyncio.get_running_loop()
+        try:
+            reported = 0
+            reported_at = -math.inf
+            while not job.started:
+                changed = self._changed
+                timeout = None
+                if on_position and (position := self.position(job)) != reported:
+                    # Every start moves every waiter, one edit each would add up to O(n²)
+                    timeout = reported_at + self.position_interval - loop.time()
+                    if timeout <= 0:
+                        reported, reported_at = position, loop.time()
+                        await on_position(position)
+                        continue
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(changed.wait(), timeout)
+
+            if on_position and reported:
+                await on_position(0)
+            return await func()
+        finally:
+            self._finish(job)
+
+
+scan_queue = ScanQueue(
+    concurrency=config.scan_concurrency,
+    user_concurrency=config.scan_user_concurrency,
+    position_interval=config.scan_position_interval,
+)
@@ -2,6 +2,9 @@
 # Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
 
 import asyncio
+from contextlib import suppress
+
+from gojira.config import config
 
 
 class ShellExceptionError(Exception):
@@ -39,3 +42,16 @@ async def shell_run(command: str) -> str:
         f"Command '{command}' exited with {process.returncode}:\n{stderr.decode("utf-8").strip()}"
     )
     raise ShellExceptionError(msg)
+
+
+async def get_version() -> str:
+    # Builds without git metadata, e.g. container images, set it at build time
+    if config.gojira_version:
+        return config.gojira_version
+
+    commit_count = commit_hash = "None"
+    with suppress(ShellExceptionError):
+        commit_count, commit_hash = await asyncio.gather(
+            shell_run("git rev-list --count HEAD"), shell_run("git rev-parse --short HEAD")
+        )
+    return f"{commit_hash} ({commit_count})"
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import shutil
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+
+from gojira.config import config
+from gojira.utils.logging import log
+
+
+class FrameExtractor:
+    """Extract representative still frames from videos with ffmpeg subprocesses."""
+
+    def __init__(self, ffmpeg_path: str, max_workers: int, timeout: float) -> None:
+        self.ffmpeg = shutil.which(ffmpeg_path)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_workers)
+
+    @property
+    def available(self) -> bool:
+        return self.ffmpeg is not None
+
+    @staticmethod
+    def _read_frames(output: Path) -> list[bytes]:
+        return [frame.read_bytes() for frame in sorted(output.glob("*.jpg"))]
+
+    async def extract(self, path: Path, max_frames: int) -> list[bytes]:
+        if self.ffmpeg is None:
+            return []
+
+        # The first frame plus the first frames of each new scene
+        select = f"eq(n\\,0)+gt(scene\\,{config.scan_scene_threshold})"
+        scale = f"scale='min({config.scan_image_size},iw)':-2"
+
+        async with self._semaphore:
+            with tempfile.TemporaryDirectory(prefix="gojira-frames-") as output:
+                process = await asyncio.create_subprocess_exec(
+                    self.ffmpeg,
+                    "-nostdin",
+                    "-v",
+                    "error",
+                    "-i",
+                    str(path),
+                    "-vf",
+                    f"select='{select}',{scale}",
+                    "-fps_mode",
+                    "vfr",
+                    "-frames:v",
+                    str(max_frames),
+                    "-q:v",
+                    "3",
+                    f"{output}/frame%02d.jpg",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+                except TimeoutError:
+                    log.warning("ffmpeg timed out extracting frames.", path=str(path))
+                    return []
+                finally:
+                    # Also when the scan is cancelled, before its output directory goes away
+                    if process.returncode is None:
+                        with suppress(ProcessLookupError):
+                            process.kill()
+                        await process.wait()
+
+                if process.returncode != 0:
+                    log.warning(
+                        "ffmpeg failed to extract frames.",
+                        path=str(path),
+                        error=stderr.decode(errors="replace").strip(),
+                    )
+
+                return await asyncio.to_thread(self._read_frames, Path(output))
+
+
+frame_extractor = FrameExtractor(
+    ffmpeg_path=config.ffmpeg_path,
+    max_workers=config.ffmpeg_workers,
+    timeout=config.ffmpeg_timeout,
+)
@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import signal
+from collections.abc import Callable
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from gojira.config import config
+from gojira.middlewares.concurrency import dispatch_controller
+from gojira.utils.logging import log
+
+
+class WebhookHandler(SimpleRequestHandler):
+    """Handle webhook updates in the background with bounded concurrency and a drain on close."""
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        concurrency: int,
+        queue_size: int,
+        drain_timeout: float,
+        metrics: Callable[[], dict[str, int]] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(dispatcher, bot, handle_in_background=True, **kwargs)
+        self.queue_size = queue_size
+        self.drain_timeout = drain_timeout
+        self.metrics = metrics
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._draining = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._background_feed_update_tasks)
+
+    async def _background_feed_update(self, bot: Bot, update: dict[str, Any]) -> None:
+        async with self._semaphore:
+            await super()._background_feed_update(bot, update)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        # Only Telegram may learn that the bot is busy
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not self.verify_secret(token, self.bot):
+            return web.Response(body="Unauthorized", status=401)
+
+        # Telegram keeps and redelivers updates answered with an error
+        if self._draining or self.pending >= self.queue_size:
+            return web.Response(status=503)
+        return await super().handle(request)
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "status": "draining" if self._draining else "ok",
+                "pending": self.pending,
+                **(self.metrics() if self.metrics else dispatch_controller.metrics),
+            },
+            status=503 if self._draining else 200,
+        )
+
+    async def close(self) -> None:
+        self._draining = True
+        if tasks := set(self._background_feed_update_tasks):
+            log.info("Draining webhook updates.", pending=len(tasks))
+            _done, unfinished = await asyncio.wait(tasks, timeout=self.drain_timeout)
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                log.warning("Cancelled unfinished webhook updates.", cancelled=len(unfinished))
+
+        await super().close()
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    allowed_updates: list[str],
+    metrics: Callable[[], dict[str, int]] | None = None,
+) -> None:
+    secret = config.webhook_secret.get_secret_value() if config.webhook_secret else None
+    handler = WebhookHandler(
+        dispatcher,
+        bot,
+        concurrency=config.webhook_concurrency,
+        queue_size=config.webhook_queue_size,
+        drain_timeout=config.webhook_drain_timeout,
+        metrics=metrics,
+        secret_token=secret,
+    )
+
+    app = web.Application()
+    handler.register(app, path=config.webhook_path)
+    app.router.add_get("/health", handler.health)
+    setup_application(app, dispatcher, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=config.webhook_host, port=config.webhook_port)
+    await site.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    try:
+        await bot.set_webhook(
+            url=f"{str(config.webhook_url).rstrip("/")}{config.webhook_path}",
+            secret_token=secret,
+            max_connections=config.webhook_max_connections,
+            allowed_updates=allowed_updates,
+        )
+        log.info(
+            "Listening for webhook updates.", host=config.webhook_host, port=config.webhook_port
+        )
+        await stop.wait()
+    finally:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(signum)
+        # The webhook stays registered so Telegram holds updates until the next start
+        await runner.cleanup()
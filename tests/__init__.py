@@ -0,0 +1,8 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import os
+
+# gojira.config needs a token at import time, no request ever reaches Telegram
+os.environ.setdefault("BOT_TOKEN", "42:TEST")
+os.environ.setdefault("CACHE_BACKEND", "memory")
@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import socket
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+BOT_USER: dict[str, Any] = {"id": 42, "is_bot": True, "first_name": "Gojira", "username": "bot"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeBotAPI:
+    """A local Bot API server that records calls and answers them with minimal results."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.port = free_port()
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def methods(self) -> list[str]:
+        return [method for method, _data in self.calls]
+
+    def bot(self) -> Bot:
+        return Bot("42:TEST", session=AiohttpSession(api=TelegramAPIServer.from_base(self.url)))
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = dict(await request.post())
+        self.calls.append((method, data))
+
+        result: Any = True
+        if method == "getMe":
+            result = BOT_USER
+        elif method.startswith("send"):
+            chat = {"id": int(str(data.get("chat_id", 1))), "type": "private"}
+            result = {
+                "message_id": len(self.calls),
+                "date": 0,
+                "chat": chat,
+                "text": data.get("text"),
+            }
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
@@ -0,0 +1,107 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import unittest
+from typing import Any
+
+from aiogram import Dispatcher, Router
+from aiogram.types import CallbackQuery
+
+from gojira.middlewares.coalescer import CallbackCoalescer
+from gojira.middlewares.concurrency import DispatchController
+from tests.fake_bot_api import FakeBotAPI
+
+
+def click(update_id: int, user_id: int, data: str) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "chat_instance": "1",
+            "data": data,
+            "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": -1, "type": "group", "title": "Group"},
+                "text": "Menu",
+            },
+        },
+    }
+
+
+class CallbackCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.api = FakeBotAPI()
+        await self.api.start()
+        self.bot = self.api.bot()
+
+        self.release = asyncio.Event()
+        self.handled: list[str] = []
+        self.coalescer = CallbackCoalescer()
+        controller = DispatchController(concurrency=4, queue_size=10, inline_max_age=5)
+        self.dispatcher = Dispatcher()
+        self.dispatcher.update.outer_middleware(self.coalescer)
+        self.dispatcher.update.outer_middleware(controller)
+        self.dispatcher.callback_query.outer_middleware(self.coalescer)
+
+        router = Router()
+
+        @router.callback_query()
+        async def render(callback: CallbackQuery) -> None:
+            await self.release.wait()
+            self.handled.append(callback.data or "")
+            await callback.answer()
+
+        self.dispatcher.include_router(router)
+
+    async def asyncTearDown(self) -> None:
+        await self.bot.session.close()
+        await self.api.stop()
+
+    async def feed(self, update_id: int, user_id: int, data: str) -> asyncio.Task:
+        task = asyncio.create_task(
+            self.dispatcher.feed_raw_update(self.bot, click(update_id, user_id, data))
+        )
+        await asyncio.sleep(0.05)
+        return task
+
+    def answered(self) -> list[str]:
+        return [
+            str(data["callback_query_id"])
+            for method, data in self.api.calls
+            if method == "answerCallbackQuery"
+        ]
+
+    async def test_superseded_click_is_answered_right_away(self) -> None:
+        tasks = [
+            await self.feed(1, 1, "page:1"),
+            await self.feed(2, 1, "page:2"),
+            await self.feed(3, 1, "page:3"),
+        ]
+
+        # The first click is being rendered, the second one waited and was replaced
+        self.assertEqual(self.answered(), ["2"])
+
+        self.release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.handled, ["page:1", "page:3"])
+        self.assertEqual(self.coalescer.coalesced, 1)
+
+    async def test_other_users_and_actions_are_kept(self) -> None:
+        tasks = [
+            await self.feed(1, 1, "page:1"),
+            await self.feed(2, 1, "page:2"),
+            await self.feed(3, 2, "page:3"),
+            await self.feed(4, 1, "close:1"),
+        ]
+
+        self.release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.handled, ["page:1", "page:2", "page:3", "close:1"])
+        self.assertEqual(self.coalescer.coalesced, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
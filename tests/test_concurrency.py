@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import multiprocessing
+import unittest
+from typing import Any
+
+from aiogram import Dispatcher, F, Router
+from aiogram.types import Message
+
+from gojira.middlewares.concurrency import DispatchController
+from gojira.utils.prefork import WorkerMetrics
+from tests.fake_bot_api import FakeBotAPI
+
+
+def message(update_id: int, text: str) -> dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": -1, "type": "group", "title": "Group"},
+            "from": {"id": update_id, "is_bot": False, "first_name": "User"},
+            "text": text,
+        },
+    }
+
+
+class ChatOrderTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.api = FakeBotAPI()
+        await self.api.start()
+        self.bot = self.api.bot()
+
+        self.release = asyncio.Event()
+        self.handled: list[str] = []
+        self.controller = DispatchController(concurrency=1, queue_size=10, inline_max_age=5)
+        self.dispatcher = Dispatcher()
+        self.dispatcher.update.outer_middleware(self.controller)
+        self.dispatcher.message.middleware(self.controller)
+
+        router = Router()
+
+        @router.message(F.text == "long", flags={"chat_order": False})
+        async def long(message: Message) -> None:
+            await self.release.wait()
+            self.handled.append("long")
+
+        @router.message(F.text == "ordered")
+        async def ordered(message: Message) -> None:
+            await self.release.wait()
+            self.handled.append("ordered")
+
+        # aiogram runs sync handlers in a thread, keep this one on the loop
+        @router.message()
+        async def short(message: Message) -> None:  # noqa: RUF029
+            self.handled.append(message.text or "")
+
+        self.dispatcher.include_router(router)
+
+    async def asyncTearDown(self) -> None:
+        await self.bot.session.close()
+        await self.api.stop()
+
+    async def feed(self, update_id: int, text: str) -> asyncio.Task:
+        task = asyncio.create_task(
+            self.dispatcher.feed_raw_update(self.bot, message(update_id, text))
+        )
+        await asyncio.sleep(0.05)
+        return task
+
+    async def test_flagged_handler_releases_the_chat(self) -> None:
+        long = await self.feed(1, "long")
+        # The only concurrency slot was given back too
+        self.assertEqual(self.controller.active, 0)
+        short = await self.feed(2, "help")
+
+        await asyncio.wait_for(short, 1)
+        self.assertEqual(self.handled, ["help"])
+
+        self.release.set()
+        await long
+        self.assertEqual(self.handled, ["help", "long"])
+
+    async def test_other_handlers_keep_the_order(self) -> None:
+        ordered = await self.feed(1, "ordered")
+        short = await self.feed(2, "help")
+
+        self.assertEqual(self.handled, [])
+        self.assertEqual(self.controller.waiting, 1)
+
+        self.release.set()
+        await asyncio.gather(ordered, short)
+        self.assertEqual(self.handled, ["ordered", "help"])
+
+    async def test_updates_past_the_queue_are_shed(self) -> None:
+        self.controller.queue_size = 1
+        ordered = await self.feed(1, "ordered")
+        queued = await self.feed(2, "help")
+        shed = await self.feed(3, "start")
+
+        await asyncio.wait_for(shed, 1)
+        self.assertEqual(self.controller.shed, 1)
+
+        self.release.set()
+        await asyncio.gather(ordered, queued)
+        self.assertEqual(self.handled, ["ordered", "help"])
+
+
+class WorkerMetricsTest(unittest.TestCase):
+    def test_total_sums_every_worker(self) -> None:
+        metrics = WorkerMetrics(multiprocessing.get_context("spawn"), 2, ("waiting", "active"))
+        metrics.publish(0, {"waiting": 1, "active": 3})
+        metrics.publish(1, {"waiting": 2, "active": 4, "shed": 5})
+
+        self.assertEqual(metrics.total(), {"waiting": 3, "active": 7})
+
+
+if __name__ == "__main__":
+    unittest.main()
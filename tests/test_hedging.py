@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import unittest
+from functools import partial
+from typing import Any
+
+from aiohttp import web
+
+from gojira.utils.aiohttp.client import AiohttpBaseClient, HedgePolicy
+from tests.fake_bot_api import free_port
+
+
+class HedgedServer:
+    """Answer the first requests slowly, the next ones right away."""
+
+    def __init__(self) -> None:
+        self.port = free_port()
+        self.slow = 0
+        self.requests = 0
+        self._runner: web.AppRunner | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.slow:
+            self.slow -= 1
+            await asyncio.sleep(1)
+        return web.json_response({"request": self.requests})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class HedgingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = HedgedServer()
+        await self.server.start()
+        self.client = AiohttpBaseClient(f"http://127.0.0.1:{self.server.port}", hedge_budget=1)
+
+        # Pretend every recent request took 50 ms, so the copy goes out after that
+        self.policy: HedgePolicy = self.client.hedging  # type: ignore[assignment]
+        for _ in range(self.policy.min_samples):
+            self.policy.observe(0.05)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.stop()
+
+    async def get(self) -> tuple[int, dict[str, Any]]:
+        return await self.client._make_request("GET", "/")
+
+    async def test_cancelled_loser_is_observed(self) -> None:
+        self.server.slow = 1
+        status, _result = await self.get()
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.policy.won, 1)
+        # The copy's latency and a lower bound for the cancelled first request
+        latencies = list(self.policy._latencies)[self.policy.min_samples :]
+        self.assertEqual(len(latencies), 2)
+        self.assertGreaterEqual(max(latencies), 0.05)
+
+    async def test_server_error_lets_the_copy_win(self) -> None:
+        async def delayed_error() -> tuple[int, dict[str, Any]]:
+            await asyncio.sleep(0.1)
+            return 503, {}
+
+        async def answer() -> tuple[int, dict[str, Any]]:
+            await asyncio.sleep(0.2)
+            return 200, {"ok": True}
+
+        requests = iter((delayed_error(), answer()))
+        status, result = await self.client._hedged(self.policy, partial(next, requests))
+
+        self.assertEqual((status, result), (200, {"ok": True}))
+        self.assertEqual(self.policy.won, 1)
+
+    async def test_both_failing_returns_the_error(self) -> None:
+        async def error() -> tuple[int, dict[str, Any]]:
+            await asyncio.sleep(0.1)
+            return 503, {}
+
+        self.assertEqual(await self.client._hedged(self.policy, error), (503, {}))
+        self.assertEqual(self.policy.hedged, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
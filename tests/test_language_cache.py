@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import unittest
+from unittest import mock
+
+from aiogram.types import User
+
+from gojira.database import LanguageEntry, StorageError, Users, language_cache, users
+
+
+class LanguageCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.user = User(id=42, is_bot=False, first_name="User")
+        language_cache.invalidate("users", self.user.id)
+
+    def tearDown(self) -> None:
+        language_cache.invalidate("users", self.user.id)
+
+    async def test_failed_read_is_not_cached(self) -> None:
+        error = StorageError("database is locked")
+        with (
+            mock.patch.object(users.storage, "get_language", side_effect=error),
+            self.assertRaises(StorageError),
+        ):
+            await Users.get_language_entry(self.user)
+
+        self.assertIsNone(language_cache.get("users", self.user.id))
+
+        with mock.patch.object(users.storage, "get_language", return_value=(True, "en")):
+            entry = await Users.get_language_entry(self.user)
+
+        self.assertEqual(entry, LanguageEntry(exists=True, language_code="en"))
+        self.assertEqual(language_cache.get("users", self.user.id), entry)
+
+
+if __name__ == "__main__":
+    unittest.main()
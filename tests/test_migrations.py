@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gojira.database import migrations
+
+
+class SqliteMigrationsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "db.sqlite3"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    async def migrate(self) -> None:
+        with mock.patch.object(migrations, "DB_PATH", self.path):
+            await migrations.migrate()
+
+    def query(self, sql: str) -> list[tuple]:
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def stats(self, table: str) -> dict[str, int]:
+        rows = self.query(
+            f"SELECT language_code, count FROM language_stats WHERE table_name = '{table}'"
+        )
+        return dict(rows)
+
+    async def test_fresh_database(self) -> None:
+        await self.migrate()
+        # Running again on an up to date database changes nothing
+        await self.migrate()
+
+        self.assertEqual(self.query("PRAGMA user_version"), [(len(migrations.MIGRATIONS),)])
+        self.assertEqual(self.query("PRAGMA auto_vacuum"), [(2,)])
+        self.assertEqual(self.query("PRAGMA journal_mode"), [("wal",)])
+        self.assertEqual(self.stats("users"), {})
+
+    async def test_old_database(self) -> None:
+        # What the bot created before it had migrations
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, language_code TEXT)")
+            conn.execute("CREATE TABLE chats (id INTEGER PRIMARY KEY, language_code TEXT)")
+            conn.executemany("INSERT INTO users VALUES (?, ?)", [(1, None), (2, ""), (3, "en")])
+            conn.execute("INSERT INTO chats VALUES (-1, 'pt_BR')")
+
+        await self.migrate()
+
+        self.assertEqual(self.query("PRAGMA user_version"), [(len(migrations.MIGRATIONS),)])
+        self.assertEqual(self.query("PRAGMA auto_vacuum"), [(2,)])
+        # NULL and '' are counted together
+        self.assertEqual(self.stats("users"), {"": 2, "en": 1})
+        self.assertEqual(self.stats("chats"), {"pt_BR": 1})
+
+    async def test_triggers_keep_counts(self) -> None:
+        await self.migrate()
+
+        with sqlite3.connect(self.path) as conn:
+            conn.executemany("INSERT INTO users VALUES (?, ?)", [(1, None), (2, "en")])
+            conn.execute("UPDATE users SET language_code = 'pt_BR' WHERE id = 1")
+            # Updates that keep the language don't count twice
+            conn.execute("UPDATE users SET language_code = 'en' WHERE id = 2")
+            conn.execute("INSERT INTO users VALUES (3, 'en')")
+            conn.execute("DELETE FROM users WHERE id = 2")
+
+        self.assertEqual(self.stats("users"), {"": 0, "en": 1, "pt_BR": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import time
+import unittest
+
+from aiogram.methods import EditMessageText, SendMessage
+
+from gojira.utils.outbound import BACKGROUND, INTERACTIVE, SendScheduler, TokenBucket
+
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_sends_go_first(self) -> None:
+        bucket = TokenBucket(rate=50, capacity=1)
+        await bucket.acquire(BACKGROUND)
+
+        served: list[str] = []
+
+        async def send(name: str, priority: int) -> None:
+            await bucket.acquire(priority)
+            served.append(name)
+
+        tasks = [
+            asyncio.create_task(send("background", BACKGROUND)),
+            asyncio.create_task(send("reply", INTERACTIVE)),
+            asyncio.create_task(send("late background", BACKGROUND)),
+        ]
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+        self.assertEqual(served, ["reply", "background", "late background"])
+
+    async def test_cancelled_waiter_hands_its_token_over(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=1)
+        await bucket.acquire(INTERACTIVE)
+
+        first = asyncio.create_task(bucket.acquire(INTERACTIVE))
+        second = asyncio.create_task(bucket.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        self.assertEqual(bucket.waiting, 2)
+
+        # Cancel the first waiter right after it got the token, before it resumes,
+        # only polling every loop step catches it in between
+        while bucket.waiting == 2:  # noqa: ASYNC110
+            await asyncio.sleep(0)
+        first.cancel()
+
+        # The next token would take 100 ms, the second waiter gets the handed over one
+        await asyncio.wait_for(second, 0.05)
+        self.assertTrue(first.cancelled())
+
+    async def test_pause_holds_every_send(self) -> None:
+        bucket = TokenBucket(rate=100, capacity=1)
+        bucket.pause(0.2)
+
+        start = time.monotonic()
+        await asyncio.wait_for(bucket.acquire(INTERACTIVE), 1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+class SendSchedulerTest(unittest.TestCase):
+    def test_buckets_stay_within_the_limits(self) -> None:
+        for limit, window in ((30, 1), (20, 60), (5, 1), (1, 1)):
+            bucket = SendScheduler.bucket(limit, window)
+            # The most that can go out in one window, starting from a full bucket
+            self.assertLessEqual(int(bucket.capacity + bucket.rate * window), limit)
+
+        # A reply and its first edits go out back to back
+        self.assertEqual(SendScheduler.bucket(20, 60).capacity, 3)
+
+    def test_group_limit_only_covers_new_messages(self) -> None:
+        scheduler = SendScheduler(global_rate=30, group_rate=20, max_retries=0)
+
+        self.assertIsNotNone(scheduler._group_bucket(SendMessage(chat_id=-1, text="Hi")))
+        self.assertIsNone(scheduler._group_bucket(SendMessage(chat_id=1, text="Hi")))
+        self.assertIsNone(
+            scheduler._group_bucket(EditMessageText(chat_id=-1, message_id=1, text="Hi"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
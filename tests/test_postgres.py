@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import os
+import unittest
+import uuid
+from importlib import import_module
+
+# Any PostgreSQL will do, everything happens in a schema that is dropped afterwards
+DSN: str | None = os.environ.get("GOJIRA_TEST_POSTGRES_DSN")
+
+
+@unittest.skipUnless(DSN, "GOJIRA_TEST_POSTGRES_DSN is not set")
+class PostgresBackendTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        # asyncpg is an optional dependency, only import it when the test runs
+        asyncpg = import_module("asyncpg")
+        self.postgres = import_module("gojira.database.backends.postgres")
+
+        assert DSN
+        self.schema = f"gojira_test_{uuid.uuid4().hex[:8]}"
+        self.admin = await asyncpg.connect(DSN)
+        await self.admin.execute(f"CREATE SCHEMA {self.schema}")
+
+        # asyncpg passes unknown DSN parameters on as server settings
+        separator = "&" if "?" in DSN else "?"
+        self.dsn = f"{DSN}{separator}search_path={self.schema}"
+        self.backends = [self.postgres.PostgresBackend(self.dsn, pool_size=2) for _ in range(3)]
+
+    async def asyncTearDown(self) -> None:
+        for backend in self.backends:
+            await backend.close()
+        await self.admin.execute(f"DROP SCHEMA {self.schema} CASCADE")
+        await self.admin.close()
+
+    async def setup_all(self) -> None:
+        await asyncio.gather(*(backend.setup() for backend in self.backends))
+
+    async def test_concurrent_migrations_apply_once(self) -> None:
+        await self.setup_all()
+        await asyncio.gather(*(backend.migrate() for backend in self.backends))
+
+        versions = await self.admin.fetch(
+            f"SELECT version FROM {self.schema}.schema_version ORDER BY version"
+        )
+        self.assertEqual(
+            [row["version"] for row in versions], list(range(1, len(self.postgres.MIGRATIONS) + 1))
+        )
+
+    async def test_upsert_languages(self) -> None:
+        await self.setup_all()
+        backend = self.backends[0]
+        await backend.migrate()
+
+        await backend.upsert_languages({
+            "users": {1: None, 2: "en", 3: "pt_BR"},
+            "chats": {-1: None},
+        })
+        # A bare registration keeps the stored language, a new one replaces it
+        await backend.upsert_languages({"users": {2: None, 3: "en"}, "chats": {-1: "en"}})
+
+        self.assertEqual(await backend.get_language("users", 1), (True, None))
+        self.assertEqual(await backend.get_language("users", 2), (True, "en"))
+        self.assertEqual(await backend.get_language("users", 3), (True, "en"))
+        self.assertEqual(await backend.get_language("users", 4), (False, None))
+
+        # The triggers keep the per-language counts in step
+        self.assertEqual(await backend.get_language_counts("users"), {"": 1, "en": 2, "pt_BR": 0})
+        self.assertEqual(await backend.get_language_counts("chats"), {"": 0, "en": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import unittest
+from functools import partial
+
+from aiohttp import web
+
+from gojira import cache
+from gojira.config import config
+from gojira.utils.aiohttp import TraceMoeClient
+from gojira.utils.scan_queue import ScanQueue
+from tests.fake_bot_api import free_port
+
+
+class ScanQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def test_round_robin_across_chats(self) -> None:
+        queue = ScanQueue(concurrency=1, user_concurrency=1, position_interval=0)
+        gate = asyncio.Event()
+        order: list[str] = []
+
+        async def scan(name: str) -> None:
+            order.append(name)
+            await gate.wait()
+
+        # The first job holds the only slot while the rest line up
+        jobs = [asyncio.create_task(queue.run(1, 1, partial(scan, "a1")))]
+        await asyncio.sleep(0)
+        for chat_id, user_id, name in ((1, 2, "a2"), (1, 3, "a3"), (2, 4, "b1"), (3, 5, "c1")):
+            jobs.append(asyncio.create_task(queue.run(chat_id, user_id, partial(scan, name))))
+            await asyncio.sleep(0)
+
+        self.assertEqual(queue.size, 4)
+        gate.set()
+        await asyncio.gather(*jobs)
+        # Chat 1 waits for its second job until chats 2 and 3 had their turn
+        self.assertEqual(order, ["a1", "a2", "b1", "c1", "a3"])
+
+    async def test_user_concurrency(self) -> None:
+        queue = ScanQueue(concurrency=4, user_concurrency=1, position_interval=0)
+        running = 0
+        peak = 0
+
+        async def scan() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await asyncio.gather(*(queue.run(1, 1, scan) for _ in range(5)))
+        self.assertEqual(peak, 1)
+
+    async def test_position_edits_are_throttled(self) -> None:
+        waiters = 20
+        edits: list[int] = []
+
+        async def on_position(position: int) -> None:
+            edits.append(position)
+            await asyncio.sleep(0)
+
+        async def scan() -> None:
+            await asyncio.sleep(0.001)
+
+        queue = ScanQueue(concurrency=1, user_concurrency=1, position_interval=60)
+        await asyncio.gather(
+            *(queue.run(chat_id, chat_id, scan, on_position) for chat_id in range(waiters))
+        )
+
+        # Each waiter reports its first place and its start, never every move in between
+        self.assertLessEqual(len(edits), 2 * waiters)
+        self.assertEqual(edits.count(0), waiters - 1)
+
+
+class TraceMoeStub:
+    """A local trace.moe with a monthly quota, failing the searches it is told to."""
+
+    def __init__(self, quota: int) -> None:
+        self.quota = quota
+        self.used = 0
+        self.fail_next = 0
+        self.port = free_port()
+        self._runner: web.AppRunner | None = None
+
+    async def me(self, request: web.Request) -> web.Response:
+        return web.json_response({"quota": self.quota, "quotaUsed": self.used})
+
+    async def search(self, request: web.Request) -> web.Response:
+        await request.read()
+        if self.fail_next:
+            self.fail_next -= 1
+            return web.json_response({"error": "Internal error"}, status=503)
+        if self.used >= self.quota:
+            return web.json_response({"error": "Search quota depleted"}, status=402)
+
+        self.used += 1
+        return web.json_response({"result": []})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/me", self.me)
+        app.router.add_post("/search", self.search)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class TraceMoeQuotaTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await cache.clear()
+        self.stub = TraceMoeStub(quota=2)
+        await self.stub.start()
+
+        self.original_url = config.trace_moe_url
+        config.trace_moe_url = f"http://127.0.0.1:{self.stub.port}"
+        self.client = TraceMoeClient()
+
+    async def asyncTearDown(self) -> None:
+        config.trace_moe_url = self.original_url
+        await self.client.close()
+        await self.stub.stop()
+
+    async def test_only_successful_searches_use_quota(self) -> None:
+        status, _data = await self.client.search(file=b"first", digest="first")
+        self.assertEqual(status, 200)
+        self.assertEqual(self.client.quota, 1)
+
+        self.stub.fail_next = 1
+        status, _data = await self.client.search(file=b"failed", digest="failed")
+        self.assertEqual(status, 503)
+        self.assertEqual(self.client.quota, 1)
+
+        status, _data = await self.client.search(file=b"second", digest="second")
+        self.assertEqual(status, 200)
+        self.assertEqual(self.client.quota, 0)
+
+        # Refused locally, without asking trace.moe
+        status, _data = await self.client.search(file=b"third", digest="third")
+        self.assertEqual(status, 402)
+        self.assertEqual(self.stub.used, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2023 Hitalo M. <https://github.com/HitaloM>
+
+import asyncio
+import os
+import signal
+import unittest
+from typing import Any
+
+from aiogram import Dispatcher, Router
+from aiogram.types import Message
+from aiohttp import ClientSession
+from pydantic import SecretStr
+
+from gojira.config import config
+from gojira.utils.webhook import run_webhook
+from tests.fake_bot_api import FakeBotAPI, free_port
+
+SECRET: str = "s3cret"
+SECRET_HEADER: str = "X-Telegram-Bot-Api-Secret-Token"
+
+UPDATE: dict[str, Any] = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 1, "type": "private"},
+        "from": {"id": 1, "is_bot": False, "first_name": "User"},
+        "text": "ping",
+    },
+}
+
+
+class WebhookTest(unittest.IsolatedAsyncioTestCase):
+    """Run the webhook server end to end against a local fake Bot API server."""
+
+    async def asyncSetUp(self) -> None:
+        self.api = FakeBotAPI()
+        await self.api.start()
+        self.bot = self.api.bot()
+
+        self.port = free_port()
+        overrides = {
+            "webhook_url": "https://example.com",
+            "webhook_host": "127.0.0.1",
+            "webhook_port": self.port,
+            "webhook_secret": SecretStr(SECRET),
+            "webhook_queue_size": 10,
+        }
+        self.original = {name: getattr(config, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(config, name, value)
+
+        self.handled: list[str] = []
+        self.dispatcher = Dispatcher()
+        router = Router()
+
+        @router.message()
+        async def pong(message: Message) -> None:
+            self.handled.append(message.text or "")
+            await message.answer("pong")
+
+        self.dispatcher.include_router(router)
+
+    async def asyncTearDown(self) -> None:
+        for name, value in self.original.items():
+            setattr(config, name, value)
+        await self.bot.session.close()
+        await self.api.stop()
+
+    async def start_webhook(self) -> asyncio.Task:
+        task = asyncio.create_task(run_webhook(self.dispatcher, self.bot, allowed_updates=[]))
+        for _ in range(100):
+            if "setWebhook" in self.api.methods():
+                break
+            await asyncio.sleep(0.05)
+        else:
+            self.fail("The webhook was never registered.")
+        return task
+
+    @staticmethod
+    async def stop_webhook(task: asyncio.Task) -> None:
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.wait_for(task, 10)
+
+    async def post_update(self, session: ClientSession, secret: str | None) -> int:
+        headers = {SECRET_HEADER: secret} if secret else {}
+        url = f"http://127.0.0.1:{self.port}{config.webhook_path}"
+        async with session.post(url, json=UPDATE, headers=headers) as response:
+            return response.status
+
+    async def test_registers_and_answers_updates(self) -> None:
+        task = await self.start_webhook()
+        async with ClientSession() as session:
+            self.assertEqual(await self.post_update(session, SECRET), 200)
+
+            async with session.get(f"http://127.0.0.1:{self.port}/health") as response:
+                self.assertEqual(response.status, 200)
+                self.assertEqual((await response.json())["status"], "ok")
+
+        # Stopping drains the update handled in the background
+        await self.stop_webhook(task)
+
+        _method, registration = self.api.calls[self.api.methods().index("setWebhook")]
+        self.assertEqual(registration["url"], f"https://example.com{config.webhook_path}")
+        self.assertEqual(registration["secret_token"], SECRET)
+        self.assertEqual(self.handled, ["ping"])
+        self.assertIn("sendMessage", self.api.methods())
+
+    async def test_rejects_unauthenticated_updates(self) -> None:
+        task = await self.start_webhook()
+        async with ClientSession() as session:
+            self.assertEqual(await self.post_update(session, None), 401)
+            self.assertEqual(await self.post_update(session, "wrong"), 401)
+        await self.stop_webhook(task)
+
+        self.assertEqual(self.handled, [])
+
+    async def test_full_queue_is_only_reported_to_telegram(self) -> None:
+        config.webhook_queue_size = 0
+        task = await self.start_webhook()
+        async with ClientSession() as session:
+            # Callers without the secret learn nothing about the bot's load
+            self.assertEqual(await self.post_update(session, None), 401)
+            self.assertEqual(await self.post_update(session, SECRET), 503)
+        await self.stop_webhook(task)
+
+        self.assertEqual(self.handled, [])
+
+
+if __name__ == "__main__":
+    unittest.main()